@@ -22,13 +22,13 @@ def main():
         # Center window on screen
         root.update_idletasks()
         width = 700
-        height = 500
+        height = 650
         x = (root.winfo_screenwidth() // 2) - (width // 2)
         y = (root.winfo_screenheight() // 2) - (height // 2)
         root.geometry(f"{width}x{height}+{x}+{y}")
         
         # Make window resizable
-        root.minsize(600, 400)
+        root.minsize(600, 550)
         
         print("="*60)
         print("🚀 Starting Parallel File Compressor GUI...")
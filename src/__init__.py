@@ -6,8 +6,16 @@ Module 1: Sequential Compression with GUI
 __version__ = "1.0.0"
 __author__ = "Your Name"
 
-from .compressor import SequentialCompressor
+from .compressor import SequentialCompressor, OperationCancelled, PzipReader
+from .parallel import ParallelCompressor
+from .tuning import AutoTuner
+from .scheduler import Job, JobManager
+from .distributed import ChunkWorker, DistributedCompressor
+from .watcher import DirectoryWatcher, StateIndex
 from .utils import FileChunker
+from .dictionary import train_dictionary
 from .gui import CompressionGUI, create_gui
 
-__all__ = ['SequentialCompressor', 'FileChunker', 'CompressionGUI', 'create_gui']
\ No newline at end of file
+__all__ = ['SequentialCompressor', 'ParallelCompressor', 'AutoTuner', 'OperationCancelled', 'PzipReader',
+           'Job', 'JobManager', 'ChunkWorker', 'DistributedCompressor',
+           'DirectoryWatcher', 'StateIndex', 'FileChunker', 'train_dictionary', 'CompressionGUI', 'create_gui']
\ No newline at end of file
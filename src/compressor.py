@@ -1,18 +1,27 @@
 import zlib
 import struct
 import os
+import threading
 from typing import Callable, Optional, Tuple
 from .utils import FileChunker
+from .dictionary import MAX_DICTIONARY_SIZE, sample_file, train_dictionary
+
+class OperationCancelled(Exception):
+    """Raised inside a compression run when its cancel event is set."""
 
 class SequentialCompressor:
     """Sequential file compression using zlib."""
     
-    def __init__(self, chunk_size: int = 1024 * 1024):
+    def __init__(self, chunk_size: int = 1024 * 1024, use_dictionary: bool = False):
         self.chunker = FileChunker(chunk_size)
         self.compression_level = 6  # Default zlib compression level
+        self.use_dictionary = use_dictionary  # Train a shared preset dictionary per file
+        self.dictionary = None
+        self._primed_compressor = None
     
     def compress_file(self, input_path: str, output_path: str, 
-                     progress_callback: Optional[Callable] = None) -> bool:
+                     progress_callback: Optional[Callable] = None,
+                     cancel_event: Optional[threading.Event] = None) -> bool:
         """
         Compress file sequentially.
         
@@ -20,6 +29,7 @@ class SequentialCompressor:
             input_path: Path to input file
             output_path: Path to output .pzip file
             progress_callback: Function to call with progress updates
+            cancel_event: When set, stop before the next chunk and remove partial output
         
         Returns:
             True if successful, False otherwise
@@ -32,6 +42,8 @@ class SequentialCompressor:
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
             
+            self.prepare_dictionary(input_path)
+            
             with open(output_path, 'wb') as output_file:
                 # Write file header
                 self._write_header(output_file, file_size, total_chunks)
@@ -39,7 +51,8 @@ class SequentialCompressor:
                 # Compress chunks sequentially
                 chunk_count = 0
                 for chunk in self.chunker.read_chunks(input_path):
-                    compressed_chunk = zlib.compress(chunk, self.compression_level)
+                    self._check_cancelled(cancel_event)
+                    compressed_chunk = self._compress_chunk(chunk)
                     
                     # Write chunk size and compressed data
                     self._write_chunk(output_file, compressed_chunk)
@@ -54,13 +67,19 @@ class SequentialCompressor:
             
             return True
             
+        except OperationCancelled:
+            self._remove_partial(output_path)
+            if progress_callback:
+                progress_callback("Compression cancelled", 0)
+            return False
         except Exception as e:
             if progress_callback:
                 progress_callback(f"Compression error: {str(e)}", 0)
             return False
     
     def decompress_file(self, input_path: str, output_path: str,
-                       progress_callback: Optional[Callable] = None) -> bool:
+                       progress_callback: Optional[Callable] = None,
+                       cancel_event: Optional[threading.Event] = None) -> bool:
         """
         Decompress .pzip file.
         
@@ -68,6 +87,7 @@ class SequentialCompressor:
             input_path: Path to .pzip file
             output_path: Path to output file
             progress_callback: Function to call with progress updates
+            cancel_event: When set, stop before the next chunk and remove partial output
         
         Returns:
             True if successful, False otherwise
@@ -105,6 +125,7 @@ class SequentialCompressor:
                     chunk_count = 0
                     
                     for chunk_num in range(total_chunks):
+                        self._check_cancelled(cancel_event)
                         # Read chunk
                         try:
                             compressed_chunk = self._read_chunk(input_file)
@@ -114,7 +135,7 @@ class SequentialCompressor:
                                 return False
                             
                             # Decompress and write
-                            decompressed_chunk = zlib.decompress(compressed_chunk)
+                            decompressed_chunk = self._decompress_chunk(compressed_chunk)
                             output_file.write(decompressed_chunk)
                             
                             chunk_count += 1
@@ -139,23 +160,92 @@ class SequentialCompressor:
             
             return True
             
+        except OperationCancelled:
+            self._remove_partial(output_path)
+            if progress_callback:
+                progress_callback("Decompression cancelled", 0)
+            return False
         except Exception as e:
             if progress_callback:
                 progress_callback(f"Decompression error: {str(e)}", 0)
             return False
     
+    def prepare_dictionary(self, input_path: str):
+        """Train the shared dictionary for input_path, or clear it if disabled."""
+        self.dictionary = None
+        if self.use_dictionary:
+            samples = sample_file(self.chunker, input_path)
+            # Keep the stored dictionary small relative to the file it serves
+            dict_size = min(MAX_DICTIONARY_SIZE, max(1024, os.path.getsize(input_path) // 64))
+            self.dictionary = train_dictionary(samples, dict_size) or None
+        # Loading a dictionary is costly; copying a primed compressor is not
+        self._primed_compressor = (zlib.compressobj(self.compression_level, zdict=self.dictionary)
+                                   if self.dictionary else None)
+    
+    def decompress_chunk(self, input_path: str, chunk_index: int) -> bytes:
+        """
+        Decompress a single chunk without decoding the ones before it.
+        
+        For repeated reads from one file use PzipReader, which keeps the
+        header, dictionary and chunk offsets between calls.
+        
+        Args:
+            input_path: Path to .pzip file
+            chunk_index: Zero-based chunk number
+        
+        Returns:
+            The original bytes of that chunk
+        """
+        with PzipReader(input_path) as reader:
+            return reader.read_chunk(chunk_index)
+    
+    def _compress_chunk(self, chunk: bytes) -> bytes:
+        """Compress one chunk as an independent zlib stream."""
+        if self._primed_compressor is None:
+            return zlib.compress(chunk, self.compression_level)
+        compressor = self._primed_compressor.copy()
+        return compressor.compress(chunk) + compressor.flush()
+    
+    def _decompress_chunk(self, compressed_chunk: bytes) -> bytes:
+        """Decompress one chunk, supplying the file's preset dictionary if any."""
+        if not self.dictionary:
+            return zlib.decompress(compressed_chunk)
+        decompressor = zlib.decompressobj(zdict=self.dictionary)
+        data = decompressor.decompress(compressed_chunk) + decompressor.flush()
+        if not decompressor.eof:
+            raise zlib.error("Incomplete compressed chunk")
+        return data
+    
+    def _check_cancelled(self, cancel_event: Optional[threading.Event]):
+        """Raise OperationCancelled if cancellation was requested."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise OperationCancelled()
+    
+    def _remove_partial(self, output_path: str):
+        """Delete an incomplete output file left by a cancelled run."""
+        try:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        except OSError:
+            pass
+    
     def _write_header(self, file, original_size: int, total_chunks: int):
         """Write file header with metadata."""
         # Magic bytes: 'PZIP'
         file.write(b'PZIP')
-        # Version: 1
-        file.write(struct.pack('<I', 1))
+        # Version: 1, or 2 when a preset dictionary follows the header
+        file.write(struct.pack('<I', 2 if self.dictionary else 1))
         # Original file size
         file.write(struct.pack('<Q', original_size))
         # Total chunks
         file.write(struct.pack('<I', total_chunks))
         # Chunk size
         file.write(struct.pack('<I', self.chunker.chunk_size))
+        if self.dictionary:
+            # Compressed dictionary length and bytes
+            packed = zlib.compress(self.dictionary, 9)
+            file.write(struct.pack('<I', len(packed)))
+            file.write(packed)
     
     def _write_chunk(self, file, compressed_data: bytes):
         """Write compressed chunk with size prefix."""
@@ -170,7 +260,7 @@ class SequentialCompressor:
             raise ValueError(f"Invalid magic bytes. Expected b'PZIP', got {magic}")
         
         version = struct.unpack('<I', file.read(4))[0]
-        if version != 1:
+        if version not in (1, 2):
             raise ValueError(f"Unsupported version: {version}")
         
         original_size = struct.unpack('<Q', file.read(8))[0]
@@ -180,6 +270,17 @@ class SequentialCompressor:
         # Update chunker chunk size to match file
         self.chunker.chunk_size = chunk_size
         
+        self.dictionary = None
+        if version == 2:
+            packed_size = struct.unpack('<I', file.read(4))[0]
+            packed = file.read(packed_size)
+            if len(packed) != packed_size:
+                raise ValueError(f"Truncated dictionary: expected {packed_size} bytes")
+            try:
+                self.dictionary = zlib.decompress(packed)
+            except zlib.error as e:
+                raise ValueError(f"Corrupt dictionary: {e}")
+        
         return original_size, total_chunks
     
     def _read_chunk(self, file) -> Optional[bytes]:
@@ -196,4 +297,52 @@ class SequentialCompressor:
         if len(chunk_data) != chunk_size:
             raise ValueError(f"Expected {chunk_size} bytes, got {len(chunk_data)}")
         
-        return chunk_data
\ No newline at end of file
+        return chunk_data
+
+class PzipReader:
+    """Random access to the chunks of a .pzip file.
+
+    The header and dictionary are read once on open. Chunk offsets are
+    recorded as chunks are skipped, so each chunk's size prefix is read
+    at most once however many times chunks are requested. Safe to share
+    between threads.
+    """
+
+    def __init__(self, input_path: str):
+        self._codec = SequentialCompressor()
+        self._file = open(input_path, 'rb')
+        try:
+            self.original_size, self.total_chunks = self._codec._read_header(self._file)
+        except Exception:
+            self._file.close()
+            raise
+        self.chunk_size = self._codec.chunker.chunk_size
+        self._offsets = [self._file.tell()]  # Offsets of the size prefixes found so far
+        self._lock = threading.Lock()
+
+    def read_chunk(self, chunk_index: int) -> bytes:
+        """Return the original bytes of chunk chunk_index (zero-based)."""
+        if not 0 <= chunk_index < self.total_chunks:
+            raise IndexError(f"Chunk {chunk_index} out of range (file has {self.total_chunks})")
+        with self._lock:
+            # Walk the size prefixes only as far as no earlier call has
+            while len(self._offsets) <= chunk_index:
+                self._file.seek(self._offsets[-1])
+                size_data = self._file.read(4)
+                if len(size_data) < 4:
+                    raise ValueError("Unexpected end of file")
+                self._offsets.append(self._offsets[-1] + 4 + struct.unpack('<I', size_data)[0])
+            self._file.seek(self._offsets[chunk_index])
+            compressed_chunk = self._codec._read_chunk(self._file)
+        if compressed_chunk is None:
+            raise ValueError("Unexpected end of file")
+        return self._codec._decompress_chunk(compressed_chunk)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'PzipReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,93 @@
+import heapq
+from collections import Counter
+from typing import List
+from .utils import FileChunker
+
+MAX_DICTIONARY_SIZE = 32 * 1024  # zlib only uses the last 32KB of a preset dictionary
+
+SUB_SAMPLE_SIZE = 2 * 1024
+
+def sample_file(chunker: FileChunker, file_path: str, max_samples: int = 128,
+                sample_size: int = 8 * 1024) -> List[bytes]:
+    """Read samples from the start of chunks spaced evenly across the whole file.
+
+    Each sampled chunk contributes up to sample_size bytes, split into
+    SUB_SAMPLE_SIZE pieces so content shared between records is counted;
+    at most max_samples pieces are returned.
+    """
+    file_size, total_chunks = chunker.get_file_info(file_path)
+    if total_chunks == 0:
+        return []
+    per_chunk = -(-min(chunker.chunk_size, sample_size) // SUB_SAMPLE_SIZE)
+    chunks_to_sample = max(1, max_samples // per_chunk)
+    step = -(-total_chunks // chunks_to_sample)
+    samples = []
+    with open(file_path, 'rb') as file:
+        for chunk_index in range(0, total_chunks, step):
+            offset, length = chunker.chunk_range(chunk_index, file_size)
+            file.seek(offset)
+            data = file.read(min(length, sample_size))
+            for start in range(0, len(data), SUB_SAMPLE_SIZE):
+                samples.append(data[start:start + SUB_SAMPLE_SIZE])
+    return samples[:max_samples]
+
+def train_dictionary(samples: List[bytes], dict_size: int = MAX_DICTIONARY_SIZE,
+                     segment_size: int = 64, k: int = 8) -> bytes:
+    """
+    Build a preset dictionary from sample data.
+
+    Segments are scored by how many samples contain each of their k-byte
+    substrings; the best segments are chosen greedily, discounting
+    substrings already covered. The highest scoring segment is placed
+    last, where zlib's back-references are cheapest.
+
+    Args:
+        samples: Sample byte strings, ideally one per record or chunk
+        dict_size: Maximum dictionary size in bytes
+        segment_size: Length of the candidate segments
+        k: Substring length used for scoring
+
+    Returns:
+        Dictionary bytes, or b'' if the samples share no content
+    """
+    dict_size = min(dict_size, MAX_DICTIONARY_SIZE)
+    counts = Counter()
+    for sample in samples:
+        counts.update({sample[i:i + k] for i in range(len(sample) - k + 1)})
+    # Only substrings seen in more than one sample are worth a dictionary slot
+    weight = {kmer: count - 1 for kmer, count in counts.items() if count > 1}
+
+    candidates = {}
+    for sample in samples:
+        for offset in range(0, max(1, len(sample) - segment_size + 1), segment_size):
+            segment = sample[offset:offset + segment_size]
+            if segment not in candidates:
+                candidates[segment] = {segment[i:i + k] for i in range(len(segment) - k + 1)} & weight.keys()
+
+    def score(segment: bytes) -> int:
+        return sum(weight.get(kmer, 0) for kmer in candidates[segment])
+
+    heap = []
+    for segment in candidates:
+        value = score(segment)
+        if value > 0:
+            heap.append((-value, segment))
+    heapq.heapify(heap)
+
+    chosen = []
+    total = 0
+    while heap and total < dict_size:
+        _, segment = heapq.heappop(heap)
+        value = score(segment)  # Re-score lazily against already covered substrings
+        if value <= 0:
+            continue
+        if heap and value < -heap[0][0]:
+            heapq.heappush(heap, (-value, segment))
+            continue
+        chosen.append(segment)
+        total += len(segment)
+        for kmer in candidates[segment]:
+            weight.pop(kmer, None)
+
+    dictionary = b''.join(reversed(chosen))
+    return dictionary[-dict_size:]
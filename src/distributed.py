@@ -0,0 +1,463 @@
+"""
+Distributed chunk compression.
+
+A coordinator (DistributedCompressor) hands chunk ranges of one input
+file to ChunkWorker processes over TCP and assembles the compressed
+chunks into a standard .pzip file in order. Chunks lost to a failed
+worker are re-queued and picked up by the remaining workers.
+
+Wire format (little-endian, matching the .pzip header style):
+    request:  b'PZTK' | chunk_index u32 | offset u64 | length u32 | level u8
+              | path_len u16 | path (utf-8) | data (length bytes, only if path_len == 0)
+    response: b'PZRS' | chunk_index u32 | status u8 | payload_len u32 | payload
+Status 0 carries the compressed chunk; any other status carries a utf-8 error.
+
+The protocol has no authentication or encryption: run workers only on a
+trusted network. Path requests are refused unless the worker was started
+with a shared_root, and then only for files inside that directory.
+"""
+
+import argparse
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import zlib
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from .compressor import OperationCancelled, SequentialCompressor
+
+REQUEST_MAGIC = b'PZTK'
+RESPONSE_MAGIC = b'PZRS'
+REQUEST_HEADER = struct.Struct('<4sIQIBH')
+RESPONSE_HEADER = struct.Struct('<4sIBI')
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+MAX_REQUEST_LENGTH = 256 * 1024 * 1024  # Upper bound on a single chunk a worker will accept
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes or raise ConnectionError."""
+    buf = bytearray()
+    while len(buf) < size:
+        part = sock.recv(size - len(buf))
+        if not part:
+            raise ConnectionError("Connection closed by peer")
+        buf.extend(part)
+    return bytes(buf)
+
+class _ChunkRequestHandler(socketserver.BaseRequestHandler):
+    """Serves chunk requests on one coordinator connection until it closes."""
+
+    def handle(self):
+        sock = self.request
+        while True:
+            try:
+                header = _recv_exact(sock, REQUEST_HEADER.size)
+            except ConnectionError:
+                return
+            magic, index, offset, length, level, path_len = REQUEST_HEADER.unpack(header)
+            if magic != REQUEST_MAGIC or length > MAX_REQUEST_LENGTH:
+                return
+            path = _recv_exact(sock, path_len).decode('utf-8', 'replace') if path_len else None
+            data = None if path else _recv_exact(sock, length)
+
+            try:
+                if path:
+                    path = self.server.resolve_shared_path(path)
+                    with open(path, 'rb') as file:
+                        file.seek(offset)
+                        data = file.read(length)
+                    if len(data) != length:
+                        raise ValueError(f"Expected {length} bytes at offset {offset}, got {len(data)}")
+                status, payload = STATUS_OK, zlib.compress(data, level)
+            except Exception as e:
+                status, payload = STATUS_ERROR, str(e).encode('utf-8')
+
+            try:
+                sock.sendall(RESPONSE_HEADER.pack(RESPONSE_MAGIC, index, status, len(payload)) + payload)
+            except OSError:
+                return  # Coordinator dropped the connection
+
+class ChunkWorker(socketserver.ThreadingTCPServer):
+    """TCP server that compresses chunks on behalf of a coordinator.
+
+    Coordinators normally send chunk bytes. Requests naming a path are
+    only served when shared_root is set, and only for files under it.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, shared_root: Optional[str] = None):
+        self.shared_root = os.path.realpath(shared_root) if shared_root else None
+        super().__init__((host, port), _ChunkRequestHandler)
+
+    def resolve_shared_path(self, path: str) -> str:
+        """Return the real path of a requested file, refusing anything outside shared_root."""
+        if self.shared_root is None:
+            raise PermissionError("Path requests are disabled on this worker")
+        real_path = os.path.realpath(path)
+        if os.path.commonpath([self.shared_root, real_path]) != self.shared_root:
+            raise PermissionError("Path is outside the worker's shared root")
+        return real_path
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """The (host, port) the worker is listening on."""
+        return self.server_address[:2]
+
+class DistributedCompressor(SequentialCompressor):
+    """Compresses a file by farming chunks out to remote ChunkWorkers.
+
+    With shared_path=True workers read their range straight from
+    input_path, which must be visible at the same path on every node and
+    lie under each worker's shared_root, so only offsets cross the
+    network. Otherwise the coordinator sends the chunk bytes along with
+    the range.
+
+    Each worker gets connections_per_worker connections (one worker
+    thread, and so one core, per connection), each keeping up to
+    pipeline_depth requests outstanding to hide network round trips.
+    """
+
+    def __init__(self, workers: List[Tuple[str, int]], chunk_size: int = 1024 * 1024,
+                 shared_path: bool = False, max_retries: int = 3,
+                 connections_per_worker: int = 4, pipeline_depth: int = 2,
+                 timeout: float = 30.0):
+        super().__init__(chunk_size)
+        if not workers:
+            raise ValueError("At least one worker address is required")
+        self.workers = list(workers)
+        self.shared_path = shared_path
+        self.max_retries = max_retries
+        self.connections_per_worker = max(1, connections_per_worker)
+        self.pipeline_depth = max(1, pipeline_depth)
+        self.timeout = timeout
+        self.metrics = {}
+
+    def compress_file(self, input_path: str, output_path: str,
+                     progress_callback: Optional[Callable] = None,
+                     cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Compress file using the configured worker nodes.
+
+        Args:
+            input_path: Path to input file
+            output_path: Path to output .pzip file
+            progress_callback: Function to call with progress updates
+            cancel_event: When set, stop before the next chunk and remove partial output
+
+        Returns:
+            True if successful, False otherwise
+        """
+        run = None
+        try:
+            file_size, total_chunks = self.chunker.get_file_info(input_path)
+            self.dictionary = None  # Workers compress without a preset dictionary
+
+            # Ensure output directory exists
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+
+            run = _DistributedRun(self, os.path.abspath(input_path), file_size, total_chunks)
+            run.start()
+
+            with open(output_path, 'wb') as output_file:
+                self._write_header(output_file, file_size, total_chunks)
+
+                # Twice the chunks the senders can have outstanding, so none sits idle
+                window = 2 * len(self.workers) * self.connections_per_worker * self.pipeline_depth
+                for chunk_num in range(total_chunks):
+                    self._check_cancelled(cancel_event)
+                    run.dispatch_until(min(total_chunks, chunk_num + window))
+                    compressed_chunk = run.wait_for(chunk_num, cancel_event)
+                    self._write_chunk(output_file, compressed_chunk)
+
+                    if progress_callback:
+                        progress = ((chunk_num + 1) / total_chunks) * 100
+                        progress_callback(f"Compressing chunk {chunk_num + 1}/{total_chunks}", progress)
+
+            run.stop()
+            self.metrics = {
+                'chunk_size': self.chunker.chunk_size,
+                'total_chunks': total_chunks,
+                'workers': len(self.workers),
+                'retries': run.retries,
+                'chunks_per_worker': dict(run.completed_by),
+                'failed_workers': list(run.failed_workers),
+            }
+
+            if progress_callback:
+                progress_callback("Compression completed successfully!", 100)
+
+            return True
+
+        except OperationCancelled:
+            if run:
+                run.stop()
+            self._remove_partial(output_path)
+            if progress_callback:
+                progress_callback("Compression cancelled", 0)
+            return False
+        except Exception as e:
+            if run:
+                run.stop()
+            if progress_callback:
+                progress_callback(f"Compression error: {str(e)}", 0)
+            return False
+
+class _Connection:
+    """One coordinator connection to a worker and the chunks it still owes."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.sock: Optional[socket.socket] = None
+        self.in_flight = deque()
+        self.dead = False
+        self.cond = threading.Condition()
+
+class _DistributedRun:
+    """State shared between the coordinator and its per-worker sender threads."""
+
+    def __init__(self, compressor: DistributedCompressor, input_path: str,
+                 file_size: int, total_chunks: int):
+        self.compressor = compressor
+        self.input_path = input_path
+        self.file_size = file_size
+        self.total_chunks = total_chunks
+        self.tasks = queue.PriorityQueue()  # Retried chunks have low indices and jump the queue
+        self.results: Dict[int, bytes] = {}
+        self.attempts: Dict[int, int] = {}
+        self.completed_by: Dict[str, int] = {}
+        self.failed_workers: List[str] = []
+        self.retries = 0
+        self.error = None
+        self.dispatched = 0
+        self.cond = threading.Condition()
+        self.threads = []
+        self.stopping = threading.Event()
+        self.sockets: List[socket.socket] = []
+
+    def start(self):
+        for address in self.compressor.workers:
+            for _ in range(self.compressor.connections_per_worker):
+                thread = threading.Thread(target=self._sender, args=(address,))
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+
+    def stop(self):
+        """Stop all senders now, discarding queued chunks and interrupting in-flight ones."""
+        self.stopping.set()
+        while True:
+            try:
+                self.tasks.get_nowait()
+            except queue.Empty:
+                break
+        for _ in self.threads:
+            self.tasks.put((-1, -1))  # Stop markers sort ahead of any chunk
+        with self.cond:
+            sockets = list(self.sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for thread in self.threads:
+            thread.join(self.compressor.timeout)
+
+    def dispatch_until(self, limit: int):
+        """Queue chunk indices up to (not including) limit."""
+        while self.dispatched < limit:
+            self.tasks.put((self.dispatched, self.dispatched))
+            self.dispatched += 1
+
+    def wait_for(self, index: int, cancel_event: Optional[threading.Event]) -> bytes:
+        """Block until chunk index has been compressed, then hand it over."""
+        with self.cond:
+            while index not in self.results:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                if self.error:
+                    raise RuntimeError(self.error)
+                if not any(thread.is_alive() for thread in self.threads):
+                    raise RuntimeError(f"All workers failed; chunk {index + 1} could not be compressed")
+                self.cond.wait(0.1)
+            return self.results.pop(index)
+
+    def _sender(self, address: Tuple[str, int]):
+        """Send requests on one worker connection until the queue is closed or the connection fails.
+
+        Responses are read by a separate receiver thread, so a worker blocked
+        sending a large response never waits on a request we are still sending.
+        """
+        compressor = self.compressor
+        input_file = None
+        receiver = None
+        connection = _Connection(f"{address[0]}:{address[1]}")
+        try:
+            connection.sock = socket.create_connection(address, timeout=compressor.timeout)
+            with self.cond:
+                self.sockets.append(connection.sock)
+            if not compressor.shared_path:
+                input_file = open(self.input_path, 'rb')
+            receiver = threading.Thread(target=self._receiver, args=(connection,))
+            receiver.daemon = True
+            receiver.start()
+
+            while not self.stopping.is_set():
+                with connection.cond:
+                    while len(connection.in_flight) >= compressor.pipeline_depth and not connection.dead:
+                        connection.cond.wait(0.1)
+                    if connection.dead:
+                        return
+                try:
+                    task = self.tasks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                index = task[1]
+                if index < 0 or self.stopping.is_set():
+                    return
+                request = self._request(index, input_file)
+                with connection.cond:
+                    if connection.dead:
+                        self.tasks.put(task)  # Never sent, so not a retry
+                        return
+                    connection.in_flight.append(index)
+                    connection.cond.notify_all()
+                connection.sock.sendall(request)
+        except OSError as e:
+            self._fail(connection, e)
+        finally:
+            if input_file:
+                input_file.close()
+            if receiver:
+                with connection.cond:
+                    connection.dead = True
+                    connection.cond.notify_all()
+                receiver.join(compressor.timeout)
+            if connection.sock:
+                connection.sock.close()
+
+    def _receiver(self, connection: '_Connection'):
+        """Collect responses for one connection; the worker answers its requests in order."""
+        while True:
+            with connection.cond:
+                while not connection.in_flight and not connection.dead:
+                    connection.cond.wait(0.1)
+                if not connection.in_flight:
+                    return
+                index = connection.in_flight[0]
+            try:
+                compressed = self._response(connection.sock, index)
+            except (OSError, ConnectionError, ValueError, struct.error) as e:
+                self._fail(connection, e)
+                return
+            with connection.cond:
+                if not connection.in_flight or connection.in_flight[0] != index:
+                    return  # Connection failed meanwhile and the chunk was re-queued
+                connection.in_flight.popleft()
+                connection.cond.notify_all()
+            with self.cond:
+                self.results[index] = compressed
+                self.completed_by[connection.name] = self.completed_by.get(connection.name, 0) + 1
+                self.cond.notify_all()
+
+    def _fail(self, connection: '_Connection', error: Exception):
+        """Close a broken connection once and re-queue the chunks it still owed."""
+        with connection.cond:
+            if connection.dead and not connection.in_flight:
+                return
+            connection.dead = True
+            lost = list(connection.in_flight)
+            connection.in_flight.clear()
+            connection.cond.notify_all()
+        try:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+        except (OSError, AttributeError):
+            pass
+        if self.stopping.is_set():
+            return  # Interrupted by stop(), not a worker failure
+        with self.cond:
+            if connection.name not in self.failed_workers:
+                self.failed_workers.append(connection.name)
+            for index in lost:
+                self._retry(index, f"worker {connection.name} failed: {error}")
+            self.cond.notify_all()
+
+    def _retry(self, index: int, reason: str):
+        """Re-queue a lost chunk; caller must hold the condition."""
+        attempts = self.attempts.get(index, 0) + 1
+        self.attempts[index] = attempts
+        if attempts > self.compressor.max_retries:
+            self.error = f"Chunk {index + 1} failed after {attempts} attempts ({reason})"
+            return
+        self.retries += 1
+        self.tasks.put((index, index))
+
+    def _request(self, index: int, input_file) -> bytes:
+        offset, length = self.compressor.chunker.chunk_range(index, self.file_size)
+        level = self.compressor.compression_level
+        if input_file is None:
+            path = self.input_path.encode('utf-8')
+            return REQUEST_HEADER.pack(REQUEST_MAGIC, index, offset, length, level, len(path)) + path
+        input_file.seek(offset)
+        data = input_file.read(length)
+        return REQUEST_HEADER.pack(REQUEST_MAGIC, index, offset, len(data), level, 0) + data
+
+    def _response(self, sock: socket.socket, index: int) -> bytes:
+        magic, resp_index, status, size = RESPONSE_HEADER.unpack(_recv_exact(sock, RESPONSE_HEADER.size))
+        if magic != RESPONSE_MAGIC or resp_index != index:
+            raise ValueError(f"Unexpected response for chunk {index + 1}")
+        payload = _recv_exact(sock, size)
+        if status != STATUS_OK:
+            raise ValueError(payload.decode('utf-8', 'replace'))
+        return payload
+
+def _parse_address(value: str) -> Tuple[str, int]:
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point: python -m src.distributed {worker,compress} ..."""
+    parser = argparse.ArgumentParser(description="Distributed .pzip compression")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    worker_cmd = sub.add_parser('worker', help="Run a chunk compression worker")
+    worker_cmd.add_argument('--host', default='127.0.0.1',
+                            help="Interface to listen on (the protocol is unauthenticated)")
+    worker_cmd.add_argument('--port', type=int, default=9750)
+    worker_cmd.add_argument('--shared-root',
+                            help="Allow path requests for files under this directory")
+
+    compress_cmd = sub.add_parser('compress', help="Coordinate compression across workers")
+    compress_cmd.add_argument('input')
+    compress_cmd.add_argument('output')
+    compress_cmd.add_argument('--worker', action='append', required=True, type=_parse_address,
+                              help="Worker address as host:port (repeatable)")
+    compress_cmd.add_argument('--chunk-size', type=int, default=1024 * 1024)
+    compress_cmd.add_argument('--connections', type=int, default=4,
+                              help="Connections (worker threads) per worker node")
+    compress_cmd.add_argument('--shared-path', action='store_true',
+                              help="Workers read the input directly from a shared filesystem")
+
+    args = parser.parse_args(argv)
+    if args.command == 'worker':
+        with ChunkWorker(args.host, args.port, args.shared_root) as worker:
+            print(f"Worker listening on {worker.address[0]}:{worker.address[1]}")
+            worker.serve_forever()
+        return 0
+
+    compressor = DistributedCompressor(args.worker, args.chunk_size, shared_path=args.shared_path,
+                                       connections_per_worker=args.connections)
+    success = compressor.compress_file(args.input, args.output,
+                                       lambda message, percentage: print(message))
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import threading
 import queue
 import os
-from .compressor import SequentialCompressor
+from typing import Optional
+from .scheduler import CANCELLED, FAILED, Job, JobManager
 
 class CompressionGUI:
     """Main GUI for the compression application."""
@@ -11,22 +11,21 @@ class CompressionGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Parallel File Compressor - Module 1")
-        self.root.geometry("700x500")
-        
-        # Initialize compressor
-        self.compressor = SequentialCompressor()
+        self.root.geometry("700x650")
         
         # Progress queue for thread communication
         self.progress_queue = queue.Queue()
         
+        # Shared job queue and worker pool
+        self.job_manager = JobManager(max_workers=2, on_update=self.job_update_callback)
+        self.reported_jobs = set()
+        
         # Variables
         self.input_file = tk.StringVar()
         self.output_file = tk.StringVar()
         
-        # Operation state
-        self.current_operation = None  # 'compress' or 'decompress'
-        
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_exit)
         self.check_progress_queue()
     
     def setup_ui(self):
@@ -68,10 +67,23 @@ class CompressionGUI:
         ttk.Label(options_frame, text="Chunk Size:").grid(row=0, column=0, sticky=tk.W)
         self.chunk_size_var = tk.StringVar(value="1MB")
         chunk_combo = ttk.Combobox(options_frame, textvariable=self.chunk_size_var,
-                                  values=["512KB", "1MB", "2MB", "4MB", "8MB"],
+                                  values=["Auto", "512KB", "1MB", "2MB", "4MB", "8MB"],
                                   state="readonly", width=10)
         chunk_combo.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
         
+        # Job priority selection
+        ttk.Label(options_frame, text="Priority:").grid(row=0, column=2, sticky=tk.W, padx=(20, 0))
+        self.priority_var = tk.StringVar(value="Normal")
+        priority_combo = ttk.Combobox(options_frame, textvariable=self.priority_var,
+                                     values=["High", "Normal", "Low"],
+                                     state="readonly", width=10)
+        priority_combo.grid(row=0, column=3, sticky=tk.W, padx=(5, 0))
+        
+        # Shared dictionary (helps small chunks of similar records)
+        self.dictionary_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Shared dictionary",
+                        variable=self.dictionary_var).grid(row=0, column=4, sticky=tk.W, padx=(20, 0))
+        
         # Action buttons frame
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=4, column=0, columnspan=3, pady=20)
@@ -89,12 +101,24 @@ class CompressionGUI:
                                              command=self.quick_decompress)
         self.quick_decompress_btn.pack(side=tk.LEFT, padx=(10, 0))
         
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel Selected",
+                                    command=self.cancel_selected_jobs)
+        self.cancel_btn.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Progress section
-        progress_frame = ttk.LabelFrame(main_frame, text="Progress", padding="5")
+        progress_frame = ttk.LabelFrame(main_frame, text="Jobs", padding="5")
         progress_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
         progress_frame.columnconfigure(0, weight=1)
         
-        # Progress bar
+        # Per-job list
+        columns = ('operation', 'file', 'priority', 'status', 'progress')
+        self.jobs_tree = ttk.Treeview(progress_frame, columns=columns, show='headings', height=5)
+        for column, width in zip(columns, (90, 250, 60, 90, 70)):
+            self.jobs_tree.heading(column, text=column.capitalize())
+            self.jobs_tree.column(column, width=width, stretch=(column == 'file'))
+        self.jobs_tree.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=5)
+        
+        # Progress bar (most recently updated job)
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var, 
                                            maximum=100)
@@ -113,7 +137,7 @@ class CompressionGUI:
         main_frame.rowconfigure(6, weight=1)
         
         # Text widget with scrollbar
-        self.log_text = tk.Text(log_frame, height=8, wrap=tk.WORD)
+        self.log_text = tk.Text(log_frame, height=6, wrap=tk.WORD)
         scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
         self.log_text.configure(yscrollcommand=scrollbar.set)
         
@@ -124,7 +148,7 @@ class CompressionGUI:
         self.log_message("Welcome to File Compression Tool!")
         self.log_message("1. Select a file to compress OR select a .pzip file to decompress")
         self.log_message("2. Choose output location")
-        self.log_message("3. Click appropriate button")
+        self.log_message("3. Click appropriate button (jobs are queued and can be cancelled)")
         self.log_message("-" * 50)
     
     def browse_input_file(self):
@@ -190,9 +214,11 @@ class CompressionGUI:
             self.output_file.set(filename)
             self.log_message(f"Output will be saved as: {os.path.basename(filename)}")
     
-    def get_chunk_size_bytes(self) -> int:
-        """Convert chunk size string to bytes."""
+    def get_chunk_size_bytes(self) -> Optional[int]:
+        """Convert chunk size string to bytes (None for automatic tuning)."""
         size_str = self.chunk_size_var.get()
+        if size_str == "Auto":
+            return None
         size_map = {
             "512KB": 512 * 1024,
             "1MB": 1024 * 1024,
@@ -208,49 +234,43 @@ class CompressionGUI:
         self.log_text.see(tk.END)
         self.root.update_idletasks()
     
-    def progress_callback(self, message: str, percentage: float):
-        """Callback for progress updates from compression thread."""
-        self.progress_queue.put(('progress', message, percentage))
+    def job_update_callback(self, job: Job):
+        """Callback for job state changes from worker threads."""
+        self.progress_queue.put(('job', job))
+    
+    def get_priority(self) -> int:
+        """Convert priority selection to a scheduler priority."""
+        return {"High": 10, "Normal": 0, "Low": -10}.get(self.priority_var.get(), 0)
     
     def check_progress_queue(self):
-        """Check for progress updates from background thread."""
+        """Check for job updates from background threads."""
         try:
             while True:
                 item = self.progress_queue.get_nowait()
-                if item[0] == 'progress':
-                    _, message, percentage = item
-                    self.status_var.set(message)
-                    self.progress_var.set(percentage)
-                    if not message.startswith("Error"):
-                        self.log_message(message)
-                elif item[0] == 'complete':
-                    _, success, message = item
-                    self.status_var.set(message)
-                    self.progress_var.set(100 if success else 0)
-                    self.log_message(message)
-                    self.enable_buttons()
-                    
-                    if success:
-                        messagebox.showinfo("Success", message)
-                    else:
-                        messagebox.showerror("Error", message)
+                if item[0] == 'job':
+                    self.update_job_row(item[1])
         except queue.Empty:
             pass
         
         # Schedule next check
         self.root.after(100, self.check_progress_queue)
     
-    def disable_buttons(self):
-        """Disable action buttons during operation."""
-        self.compress_btn.config(state='disabled')
-        self.decompress_btn.config(state='disabled')
-        self.quick_decompress_btn.config(state='disabled')
-    
-    def enable_buttons(self):
-        """Enable action buttons after operation."""
-        self.compress_btn.config(state='normal')
-        self.decompress_btn.config(state='normal')
-        self.quick_decompress_btn.config(state='normal')
+    def update_job_row(self, job: Job):
+        """Refresh a job's row in the job list and the overall status."""
+        item = str(job.id)
+        values = (job.operation, os.path.basename(job.input_path), job.priority,
+                  job.status, f"{job.progress:.0f}%")
+        if self.jobs_tree.exists(item):
+            self.jobs_tree.item(item, values=values)
+        else:
+            self.jobs_tree.insert('', tk.END, iid=item, values=values)
+        
+        self.status_var.set(f"Job {job.id}: {job.message}")
+        self.progress_var.set(job.progress)
+        
+        if job.finished and job.id not in self.reported_jobs:
+            self.reported_jobs.add(job.id)
+            self.log_message(self._completion_message(job))
     
     def validate_files(self, input_path, output_path, operation):
         """Validate input and output files for the operation."""
@@ -274,7 +294,7 @@ class CompressionGUI:
         return True, "Validation passed"
     
     def start_compression(self):
-        """Start compression in background thread."""
+        """Queue a compression job."""
         input_path = self.input_file.get().strip()
         output_path = self.output_file.get().strip()
         
@@ -284,25 +304,17 @@ class CompressionGUI:
             messagebox.showerror("Validation Error", message)
             return
         
-        # Update compressor chunk size
-        chunk_size = self.get_chunk_size_bytes()
-        self.compressor = SequentialCompressor(chunk_size)
-        
-        self.current_operation = 'compress'
-        self.disable_buttons()
-        self.progress_var.set(0)
-        self.log_message(f"Starting compression of: {os.path.basename(input_path)}")
+        self.log_message(f"Queued compression of: {os.path.basename(input_path)}")
         self.log_message(f"Output: {os.path.basename(output_path)}")
         self.log_message(f"Chunk size: {self.chunk_size_var.get()}")
-        
-        # Start compression in background thread
-        thread = threading.Thread(target=self._compression_worker, 
-                                 args=(input_path, output_path))
-        thread.daemon = True
-        thread.start()
+        if self.dictionary_var.get():
+            self.log_message("Using shared dictionary")
+        self.job_manager.submit('compress', input_path, output_path,
+                                self.get_priority(), self.get_chunk_size_bytes(),
+                                self.dictionary_var.get())
     
     def start_decompression(self):
-        """Start decompression in background thread."""
+        """Queue a decompression job."""
         input_path = self.input_file.get().strip()
         output_path = self.output_file.get().strip()
         
@@ -312,17 +324,10 @@ class CompressionGUI:
             messagebox.showerror("Validation Error", message)
             return
         
-        self.current_operation = 'decompress'
-        self.disable_buttons()
-        self.progress_var.set(0)
-        self.log_message(f"Starting decompression of: {os.path.basename(input_path)}")
+        self.log_message(f"Queued decompression of: {os.path.basename(input_path)}")
         self.log_message(f"Output: {os.path.basename(output_path)}")
-        
-        # Start decompression in background thread
-        thread = threading.Thread(target=self._decompression_worker, 
-                                 args=(input_path, output_path))
-        thread.daemon = True
-        thread.start()
+        self.job_manager.submit('decompress', input_path, output_path,
+                                self.get_priority(), self.get_chunk_size_bytes())
     
     def quick_decompress(self):
         """Quick decompress - automatically select .pzip file and output location."""
@@ -345,55 +350,51 @@ class CompressionGUI:
         if not output_file:
             return
         
-        # Set the fields and start decompression
+        # Set the fields and queue decompression
         self.input_file.set(pzip_file)
         self.output_file.set(output_file)
         
         self.log_message(f"Quick decompress: {os.path.basename(pzip_file)} → {os.path.basename(output_file)}")
-        
-        self.current_operation = 'decompress'
-        self.disable_buttons()
-        self.progress_var.set(0)
-        
-        # Start decompression in background thread
-        thread = threading.Thread(target=self._decompression_worker, 
-                                 args=(pzip_file, output_file))
-        thread.daemon = True
-        thread.start()
+        self.job_manager.submit('decompress', pzip_file, output_file,
+                                self.get_priority(), self.get_chunk_size_bytes())
     
-    def _compression_worker(self, input_path: str, output_path: str):
-        """Background worker for compression."""
-        try:
-            success = self.compressor.compress_file(input_path, output_path, 
-                                                   self.progress_callback)
-            if success:
-                original_size = os.path.getsize(input_path)
-                compressed_size = os.path.getsize(output_path)
-                ratio = (1 - compressed_size / original_size) * 100
-                message = f"Compression completed! Original: {original_size:,} bytes, Compressed: {compressed_size:,} bytes. Saved {ratio:.1f}% space."
-            else:
-                message = "Compression failed. Check the log for details."
-            
-            self.progress_queue.put(('complete', success, message))
-            
-        except Exception as e:
-            self.progress_queue.put(('complete', False, f"Compression error: {str(e)}"))
+    def cancel_selected_jobs(self):
+        """Request cancellation of the jobs selected in the job list."""
+        selection = self.jobs_tree.selection()
+        if not selection:
+            messagebox.showinfo("Cancel", "Select one or more jobs to cancel.")
+            return
+        for item in selection:
+            if self.job_manager.cancel(int(item)):
+                self.log_message(f"Cancellation requested for job {item}")
     
-    def _decompression_worker(self, input_path: str, output_path: str):
-        """Background worker for decompression."""
+    def _completion_message(self, job: Job) -> str:
+        """Summary line for a finished job."""
+        name = os.path.basename(job.input_path)
+        if job.status == CANCELLED:
+            return f"Job {job.id} ({name}) cancelled; partial output removed."
+        if job.status == FAILED:
+            return f"Job {job.id} ({name}) failed: {job.message}"
         try:
-            success = self.compressor.decompress_file(input_path, output_path, 
-                                                     self.progress_callback)
-            if success:
-                decompressed_size = os.path.getsize(output_path)
-                message = f"Decompression completed! Output size: {decompressed_size:,} bytes."
-            else:
-                message = "Decompression failed. Check the log for details."
-            
-            self.progress_queue.put(('complete', success, message))
-            
-        except Exception as e:
-            self.progress_queue.put(('complete', False, f"Decompression error: {str(e)}"))
+            if job.operation == 'compress':
+                original_size = os.path.getsize(job.input_path)
+                compressed_size = os.path.getsize(job.output_path)
+                ratio = (1 - compressed_size / original_size) * 100 if original_size else 0.0
+                message = (f"Job {job.id} compression completed! Original: {original_size:,} bytes, "
+                           f"Compressed: {compressed_size:,} bytes. Saved {ratio:.1f}% space.")
+                tuning = job.metrics.get('tuning')
+                if tuning:
+                    message += f" Auto-tuned: {tuning['chunk_size']:,} byte chunks, {tuning['workers']} workers."
+                return message
+            decompressed_size = os.path.getsize(job.output_path)
+            return f"Job {job.id} decompression completed! Output size: {decompressed_size:,} bytes."
+        except OSError:
+            return f"Job {job.id} {job.operation} completed."
+    
+    def on_exit(self):
+        """Cancel outstanding jobs and close the window."""
+        self.job_manager.shutdown(wait=False, cancel_pending=True)
+        self.root.destroy()
 
 def create_gui():
     """Create and return the main GUI window."""
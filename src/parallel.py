@@ -0,0 +1,221 @@
+import zlib
+import struct
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from .compressor import OperationCancelled, SequentialCompressor
+from .tuning import AutoTuner
+
+class ParallelCompressor(SequentialCompressor):
+    """Chunk-parallel file compression using zlib on a thread pool.
+
+    zlib releases the GIL while (de)compressing a buffer, so chunks are
+    processed concurrently on threads. Output uses the same .pzip format
+    as SequentialCompressor; chunks are always written in input order.
+    """
+
+    def __init__(self, chunk_size: int = 1024 * 1024, workers: Optional[int] = None,
+                 auto_tune: bool = False, tuner: Optional[AutoTuner] = None,
+                 use_dictionary: bool = False):
+        super().__init__(chunk_size, use_dictionary)
+        self.workers = workers or AutoTuner.available_cpus()
+        self.auto_tune = auto_tune
+        self.tuner = tuner or (AutoTuner() if auto_tune else None)
+        self.metrics = {}
+
+    def _max_in_flight(self) -> int:
+        """Number of chunks allowed to be queued or running at once."""
+        return self.workers * AutoTuner.CHUNKS_PER_WORKER
+
+    def compress_file(self, input_path: str, output_path: str,
+                     progress_callback: Optional[Callable] = None,
+                     cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Compress file with chunks processed in parallel.
+
+        Args:
+            input_path: Path to input file
+            output_path: Path to output .pzip file
+            progress_callback: Function to call with progress updates
+            cancel_event: When set, stop before the next chunk and remove partial output
+
+        Returns:
+            True if successful, False otherwise
+        """
+        # Auto-tuned settings apply to this run only
+        workers, chunk_size = self.workers, self.chunker.chunk_size
+        try:
+            self.metrics = {}
+            if self.auto_tune:
+                choice = self.tuner.choose(os.path.getsize(input_path),
+                                           os.path.dirname(os.path.abspath(output_path)),
+                                           max_workers=self.workers)
+                self.chunker.chunk_size = choice['chunk_size']
+                self.workers = choice['workers']
+                self.metrics['tuning'] = choice
+                if progress_callback:
+                    progress_callback(f"Auto-tuned: chunk size {choice['chunk_size']:,} bytes, "
+                                      f"{choice['workers']} workers", 0)
+
+            file_size, total_chunks = self.chunker.get_file_info(input_path)
+            self.prepare_dictionary(input_path)
+
+            # Ensure output directory exists
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+
+            start_time = time.perf_counter()
+            with open(output_path, 'wb') as output_file, \
+                    ThreadPoolExecutor(max_workers=self.workers) as pool:
+                self._write_header(output_file, file_size, total_chunks)
+
+                pending = deque()
+                chunk_count = 0
+                for chunk in self.chunker.read_chunks(input_path):
+                    self._check_cancelled(cancel_event)
+                    pending.append(pool.submit(self._compress_chunk, chunk))
+                    if len(pending) >= self._max_in_flight():
+                        self._write_chunk(output_file, pending.popleft().result())
+                        chunk_count += 1
+                        self._report(progress_callback, "Compressing", chunk_count, total_chunks)
+
+                while pending:
+                    self._write_chunk(output_file, pending.popleft().result())
+                    chunk_count += 1
+                    self._report(progress_callback, "Compressing", chunk_count, total_chunks)
+
+            self._record_metrics(file_size, total_chunks, time.perf_counter() - start_time)
+
+            if progress_callback:
+                progress_callback("Compression completed successfully!", 100)
+
+            return True
+
+        except OperationCancelled:
+            self._remove_partial(output_path)
+            if progress_callback:
+                progress_callback("Compression cancelled", 0)
+            return False
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"Compression error: {str(e)}", 0)
+            return False
+        finally:
+            self.workers, self.chunker.chunk_size = workers, chunk_size
+
+    def decompress_file(self, input_path: str, output_path: str,
+                       progress_callback: Optional[Callable] = None,
+                       cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Decompress .pzip file with chunks processed in parallel.
+
+        Args:
+            input_path: Path to .pzip file
+            output_path: Path to output file
+            progress_callback: Function to call with progress updates
+            cancel_event: When set, stop before the next chunk and remove partial output
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if not os.path.exists(input_path):
+                if progress_callback:
+                    progress_callback("Error: Input file does not exist", 0)
+                return False
+
+            file_size = os.path.getsize(input_path)
+            if file_size < 24:  # Minimum header size
+                if progress_callback:
+                    progress_callback(f"Error: File too small ({file_size} bytes). Not a valid .pzip file", 0)
+                return False
+
+            # Ensure output directory exists
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+
+            with open(input_path, 'rb') as input_file:
+                try:
+                    original_size, total_chunks = self._read_header(input_file)
+                    if progress_callback:
+                        progress_callback(f"Starting decompression: {total_chunks} chunks", 0)
+                except ValueError as e:
+                    if progress_callback:
+                        progress_callback(f"Invalid .pzip file: {str(e)}", 0)
+                    return False
+
+                with open(output_path, 'wb') as output_file, \
+                        ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    pending = deque()
+                    chunk_count = 0
+
+                    try:
+                        for chunk_num in range(total_chunks):
+                            self._check_cancelled(cancel_event)
+                            compressed_chunk = self._read_chunk(input_file)
+                            if compressed_chunk is None:
+                                if progress_callback:
+                                    progress_callback(f"Error: Unexpected end of file at chunk {chunk_num + 1}", 0)
+                                return False
+
+                            pending.append(pool.submit(self._decompress_chunk, compressed_chunk))
+                            if len(pending) >= self._max_in_flight():
+                                output_file.write(pending.popleft().result())
+                                chunk_count += 1
+                                self._report(progress_callback, "Decompressing", chunk_count, total_chunks)
+
+                        while pending:
+                            output_file.write(pending.popleft().result())
+                            chunk_count += 1
+                            self._report(progress_callback, "Decompressing", chunk_count, total_chunks)
+
+                    except (zlib.error, struct.error) as e:
+                        if progress_callback:
+                            progress_callback(f"Error decompressing chunk {chunk_count + 1}: {str(e)}", 0)
+                        return False
+
+            # Verify output file size matches expected
+            actual_size = os.path.getsize(output_path)
+            if actual_size != original_size:
+                if progress_callback:
+                    progress_callback(f"Size mismatch: expected {original_size}, got {actual_size}", 0)
+                return False
+
+            if progress_callback:
+                progress_callback("Decompression completed successfully!", 100)
+
+            return True
+
+        except OperationCancelled:
+            self._remove_partial(output_path)
+            if progress_callback:
+                progress_callback("Decompression cancelled", 0)
+            return False
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"Decompression error: {str(e)}", 0)
+            return False
+
+    def _report(self, progress_callback: Optional[Callable], verb: str,
+                chunk_count: int, total_chunks: int):
+        """Send a per-chunk progress update."""
+        if progress_callback:
+            progress = (chunk_count / total_chunks) * 100
+            progress_callback(f"{verb} chunk {chunk_count}/{total_chunks}", progress)
+
+    def _record_metrics(self, file_size: int, total_chunks: int, elapsed: float):
+        """Store throughput figures for the last compression run."""
+        self.metrics.update({
+            'chunk_size': self.chunker.chunk_size,
+            'workers': self.workers,
+            'dictionary_size': len(self.dictionary) if self.dictionary else 0,
+            'total_chunks': total_chunks,
+            'bytes_in': file_size,
+            'elapsed_seconds': elapsed,
+            'throughput_mb_s': (file_size / (1024 * 1024)) / elapsed if elapsed > 0 else 0.0,
+        })
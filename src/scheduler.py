@@ -0,0 +1,217 @@
+import itertools
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
+from .compressor import SequentialCompressor
+from .parallel import ParallelCompressor
+from .tuning import AutoTuner
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+class Job:
+    """A single queued compress or decompress request."""
+
+    def __init__(self, job_id: int, operation: str, input_path: str, output_path: str,
+                 priority: int = 0, chunk_size: Optional[int] = None,
+                 use_dictionary: bool = False):
+        if operation not in ('compress', 'decompress'):
+            raise ValueError(f"Unknown operation: {operation}")
+        self.id = job_id
+        self.operation = operation
+        self.input_path = input_path
+        self.output_path = output_path
+        self.priority = priority
+        self.chunk_size = chunk_size  # None selects automatic tuning
+        self.use_dictionary = use_dictionary
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Queued"
+        self.metrics = {}
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+def default_compressor_factory(job: Job, workers: Optional[int] = None,
+                               tuner: Optional[AutoTuner] = None) -> SequentialCompressor:
+    """Fixed chunk sizes run sequentially; automatic jobs use the tuned parallel path.
+
+    workers caps the codec threads an automatic job may start.
+    """
+    if job.chunk_size is None:
+        return ParallelCompressor(workers=workers, auto_tune=True, tuner=tuner,
+                                  use_dictionary=job.use_dictionary)
+    return SequentialCompressor(job.chunk_size, job.use_dictionary)
+
+class JobManager:
+    """Runs queued jobs on a bounded pool of worker threads.
+
+    Jobs with a higher priority start first; equal priorities run in
+    submission order. Cancellation is cooperative: a running job stops
+    before its next chunk and its partial output is removed.
+
+    With the default factory the available CPUs are split between the
+    job threads, so concurrent automatic jobs never start more codec
+    threads than there are CPUs, and they share one calibration.
+    """
+
+    def __init__(self, max_workers: int = 2,
+                 on_update: Optional[Callable[[Job], None]] = None,
+                 compressor_factory: Optional[Callable[[Job], SequentialCompressor]] = None):
+        self.max_workers = max(1, max_workers)
+        self.on_update = on_update
+        self.codec_workers = max(1, AutoTuner.available_cpus() // self.max_workers)
+        self._tuner = None if compressor_factory else AutoTuner()
+        self.compressor_factory = compressor_factory or self._default_compressor
+        self._queue = queue.PriorityQueue()
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._unfinished = 0
+        self._threads = []
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, name=f"pzip-job-worker-{i}")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, operation: str, input_path: str, output_path: str,
+               priority: int = 0, chunk_size: Optional[int] = None,
+               use_dictionary: bool = False) -> Job:
+        """Queue a job and return it."""
+        with self._lock:
+            job = Job(next(self._ids), operation, input_path, output_path, priority,
+                      chunk_size, use_dictionary)
+            self._jobs[job.id] = job
+            self._unfinished += 1
+        self._queue.put((-priority, next(self._seq), job))
+        self._notify(job)
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Request cancellation. Returns False if the job is unknown or already finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.cancel_event.set()
+            queued = job.status == QUEUED
+            if queued:
+                self._finish(job, CANCELLED, "Cancelled before start")
+        if queued:
+            self._notify(job)
+            self._mark_done()
+        return True
+
+    def get(self, job_id: int) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def forget(self, job_id: int) -> bool:
+        """Drop a finished job from the history. Returns False if it is unknown or still active."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.finished:
+                return False
+            del self._jobs[job_id]
+            return True
+
+    def jobs(self) -> List[Job]:
+        """All known jobs in submission order."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.id)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted job has finished. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """Stop the worker threads, optionally cancelling outstanding jobs first."""
+        if cancel_pending:
+            with self._lock:
+                active = [job.id for job in self._jobs.values() if not job.finished]
+            for job_id in active:
+                self.cancel(job_id)
+        for _ in self._threads:
+            # Sentinels sort after every real job
+            self._queue.put((float('inf'), next(self._seq), None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _default_compressor(self, job: Job) -> SequentialCompressor:
+        return default_compressor_factory(job, self.codec_workers, self._tuner)
+
+    def _finish(self, job: Job, status: str, message: str):
+        """Mark a job finished; caller must hold the lock."""
+        job.status = status
+        job.message = message
+        if status == COMPLETED:
+            job.progress = 100.0
+
+    def _mark_done(self):
+        """Count a finished job once its final update has been delivered."""
+        with self._lock:
+            self._unfinished -= 1
+            if self._unfinished == 0:
+                self._idle.notify_all()
+
+    def _notify(self, job: Job):
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.status != QUEUED:
+                    continue  # Cancelled while waiting
+                job.status = RUNNING
+                job.message = "Starting"
+            self._notify(job)
+            self._run(job)
+
+    def _run(self, job: Job):
+        def progress_callback(message: str, percentage: float):
+            job.message = message
+            if percentage > 0 or job.progress == 0:
+                job.progress = percentage
+            self._notify(job)
+
+        try:
+            compressor = self.compressor_factory(job)
+            if job.operation == 'compress':
+                success = compressor.compress_file(job.input_path, job.output_path,
+                                                   progress_callback, job.cancel_event)
+            else:
+                success = compressor.decompress_file(job.input_path, job.output_path,
+                                                     progress_callback, job.cancel_event)
+            job.metrics = dict(getattr(compressor, 'metrics', {}))
+            error = None
+        except Exception as e:
+            success = False
+            error = f"{job.operation.capitalize()} error: {str(e)}"
+
+        with self._lock:
+            if success:
+                self._finish(job, COMPLETED, f"{job.operation.capitalize()} completed")
+            elif job.cancel_event.is_set():
+                self._finish(job, CANCELLED, "Cancelled")
+            else:
+                self._finish(job, FAILED, error or job.message)
+        self._notify(job)
+        self._mark_done()
@@ -0,0 +1,207 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+KB = 1024
+MB = 1024 * 1024
+
+class AutoTuner:
+    """Picks chunk size and worker count from file size, CPUs and a calibration probe.
+
+    The probe measures single-core zlib throughput once per host and
+    sequential write throughput once per output directory, since temp
+    directories are often tmpfs. Results are cached as JSON, keyed by
+    host and by the directory measured, so later runs only pay for a
+    file read.
+    """
+
+    MIN_CHUNK_SIZE = 64 * KB
+    MAX_CHUNK_SIZE = 8 * MB
+    CHUNKS_PER_WORKER = 4      # In-flight chunks wanted per worker
+    MIN_CHUNK_SECONDS = 0.005  # Keep per-chunk codec time above task overhead
+    CACHE_MAX_AGE = 7 * 24 * 3600
+
+    def __init__(self, cache_path: Optional[str] = None, compression_level: int = 6,
+                 probe_size: int = 4 * MB):
+        self.cache_path = cache_path or self.default_cache_path()
+        self.compression_level = compression_level
+        self.probe_size = probe_size
+        self._calibration = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_cache_path() -> str:
+        """Per-user location of the calibration cache."""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'pzip', 'calibration.json')
+
+    @staticmethod
+    def available_cpus() -> int:
+        """CPUs this process may run on (respects affinity masks where supported)."""
+        if hasattr(os, 'sched_getaffinity'):
+            return max(1, len(os.sched_getaffinity(0)))
+        return os.cpu_count() or 1
+
+    def calibrate(self, force: bool = False, output_dir: Optional[str] = None) -> Dict:
+        """
+        Return host calibration, running the probes if no fresh cached result exists.
+
+        Args:
+            force: Re-run every probe even if a cached result is fresh
+            output_dir: Directory whose storage is measured (default: the temp directory)
+
+        Returns:
+            Dict with the codec and disk rates and 'disk_probe_dir', the directory measured
+        """
+        probe_dir = self._probe_dir(output_dir)
+        with self._lock:
+            host = socket.gethostname()
+            if self._calibration is None or force:
+                entry = self._load_cache().get(host)
+                if (force or not entry or entry.get('compression_level') != self.compression_level
+                        or time.time() - entry.get('timestamp', 0) >= self.CACHE_MAX_AGE):
+                    entry = {
+                        'codec_bytes_per_sec': self._probe_codec(),
+                        'compression_level': self.compression_level,
+                        'timestamp': time.time(),
+                    }
+                self._calibration = entry
+
+            disk = self._calibration.setdefault('disk', {})
+            if probe_dir not in disk:
+                disk[probe_dir] = self._probe_disk(probe_dir)
+                cache = self._load_cache()
+                cache[host] = self._calibration
+                self._save_cache(cache)
+
+            return {
+                'codec_bytes_per_sec': self._calibration['codec_bytes_per_sec'],
+                'disk_bytes_per_sec': disk[probe_dir],
+                'disk_probe_dir': probe_dir,
+                'compression_level': self._calibration.get('compression_level'),
+                'timestamp': self._calibration.get('timestamp'),
+            }
+
+    def choose(self, file_size: int, output_dir: Optional[str] = None,
+               max_workers: Optional[int] = None) -> Dict:
+        """
+        Choose chunk size and worker count for a file.
+
+        Args:
+            file_size: Size of the input file in bytes
+            output_dir: Directory the output will be written to
+            max_workers: Upper bound on the worker count (default: available CPUs)
+
+        Returns:
+            Dict with 'chunk_size', 'workers', the inputs used and 'reason'
+        """
+        calibration = self.calibrate(output_dir=output_dir)
+        codec_rate = max(1.0, calibration['codec_bytes_per_sec'])
+        disk_rate = max(1.0, calibration['disk_bytes_per_sec'])
+        cpus = self.available_cpus()
+        budget = max(1, min(cpus, max_workers or cpus))
+
+        # Smallest chunk whose codec time still dominates per-chunk overhead
+        min_chunk = self._round_pow2(max(self.MIN_CHUNK_SIZE, int(codec_rate * self.MIN_CHUNK_SECONDS)))
+        min_chunk = min(min_chunk, self.MAX_CHUNK_SIZE)
+
+        # More workers than storage can feed only adds contention
+        io_bound_workers = max(1, -(-int(disk_rate) // int(codec_rate)))
+        workers = min(budget, io_bound_workers)
+
+        if file_size <= min_chunk:
+            # Tiny file: one chunk, no pool, minimal header overhead
+            chunk_size = max(self.MIN_CHUNK_SIZE, self._round_pow2(max(1, file_size)))
+            workers = 1
+            reason = 'single chunk (file smaller than minimum efficient chunk)'
+        else:
+            target = file_size // (workers * self.CHUNKS_PER_WORKER)
+            chunk_size = min(self.MAX_CHUNK_SIZE, max(min_chunk, self._round_pow2(target)))
+            total_chunks = -(-file_size // chunk_size)
+            workers = max(1, min(workers, total_chunks))
+            if workers < budget and workers == io_bound_workers:
+                reason = 'limited by storage throughput'
+            elif chunk_size == self.MAX_CHUNK_SIZE:
+                reason = 'large file, maximum chunk size'
+            else:
+                reason = f'{self.CHUNKS_PER_WORKER} chunks in flight per worker'
+
+        return {
+            'chunk_size': chunk_size,
+            'workers': workers,
+            'file_size': file_size,
+            'cpus': cpus,
+            'codec_bytes_per_sec': codec_rate,
+            'disk_bytes_per_sec': disk_rate,
+            'disk_probe_dir': calibration['disk_probe_dir'],
+            'reason': reason,
+        }
+
+    @staticmethod
+    def _round_pow2(value: int) -> int:
+        """Round up to the next power of two."""
+        return 1 << max(0, (value - 1).bit_length())
+
+    def _probe_sample(self) -> bytes:
+        """Moderately compressible sample data (mixed text and noise)."""
+        text = b"timestamp=2024-01-01T00:00:00Z level=INFO component=compressor msg=chunk processed\n"
+        block = text * 64 + os.urandom(len(text) * 16)
+        return (block * (self.probe_size // len(block) + 1))[:self.probe_size]
+
+    def _probe_codec(self) -> float:
+        """Single-core zlib compression throughput in bytes per second."""
+        sample = self._probe_sample()
+        start = time.perf_counter()
+        zlib.compress(sample, self.compression_level)
+        elapsed = time.perf_counter() - start
+        return len(sample) / elapsed if elapsed > 0 else float(len(sample))
+
+    @staticmethod
+    def _probe_dir(output_dir: Optional[str]) -> str:
+        """Nearest existing directory at or above output_dir, as a real path."""
+        path = os.path.realpath(output_dir or tempfile.gettempdir())
+        while not os.path.isdir(path) and os.path.dirname(path) != path:
+            path = os.path.dirname(path)
+        return path
+
+    def _probe_disk(self, directory: str) -> float:
+        """Sequential write throughput of a directory in bytes per second."""
+        sample = os.urandom(self.probe_size)
+        fd, path = tempfile.mkstemp(prefix='.pzip-probe-', dir=directory)
+        try:
+            start = time.perf_counter()
+            with os.fdopen(fd, 'wb') as f:
+                f.write(sample)
+                f.flush()
+                os.fsync(f.fileno())
+            elapsed = time.perf_counter() - start
+        finally:
+            os.remove(path)
+        return len(sample) / elapsed if elapsed > 0 else float(len(sample))
+
+    def _load_cache(self) -> Dict:
+        """Read the calibration cache, ignoring missing or corrupt files."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict):
+        """Write the calibration cache atomically; failures are not fatal."""
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
@@ -21,4 +21,9 @@ class FileChunker:
         """Returns (file_size, estimated_chunks)."""
         file_size = os.path.getsize(file_path)
         estimated_chunks = (file_size + self.chunk_size - 1) // self.chunk_size
-        return file_size, estimated_chunks
\ No newline at end of file
+        return file_size, estimated_chunks
+    
+    def chunk_range(self, chunk_index: int, file_size: int) -> Tuple[int, int]:
+        """Returns (offset, length) of a chunk within a file of the given size."""
+        offset = chunk_index * self.chunk_size
+        return offset, max(0, min(self.chunk_size, file_size - offset))
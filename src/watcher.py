@@ -0,0 +1,404 @@
+"""
+Directory watch service.
+
+Polls a spool directory and compresses new or changed files into an
+output directory through a bounded JobManager pool. A persisted state
+index records (size, mtime, hash) per compressed file so restarts only
+stat files instead of re-reading them.
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+from .compressor import SequentialCompressor
+from .scheduler import COMPLETED, FAILED, Job, JobManager
+from .tuning import AutoTuner
+from .utils import FileChunker
+
+IndexEntry = Tuple[int, int, str]  # (size, mtime_ns, hash)
+
+FAILED_DIGEST = '!failed'  # Index marker: compression failed for this (size, mtime)
+
+def file_hash(path: str, block_size: int = 1024 * 1024) -> str:
+    """Short content hash used to skip files whose mtime changed but content did not."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+class _HashingChunker(FileChunker):
+    """FileChunker that hashes the file in the same pass that reads it for compression."""
+
+    def __init__(self, chunk_size: int):
+        super().__init__(chunk_size)
+        self.digest = None
+
+    def read_chunks(self, file_path: str) -> Iterator[bytes]:
+        digest = hashlib.blake2b(digest_size=8)
+        for chunk in super().read_chunks(file_path):
+            digest.update(chunk)
+            yield chunk
+        self.digest = digest.hexdigest()
+
+class StateIndex:
+    """Append-only journal of compressed files, compacted when it grows stale.
+
+    Each line is 'size<TAB>mtime_ns<TAB>hash<TAB>path'; a line of
+    '-<TAB>path' removes an entry. Later lines win, so updates are a
+    single append rather than a rewrite of the whole index. A hash of
+    FAILED_DIGEST records a failed compression, so the file is only
+    retried once it changes.
+    """
+
+    HEADER = "PZIPIDX1\n"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, IndexEntry] = {}
+        self._journal_lines = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def get(self, rel_path: str) -> Optional[IndexEntry]:
+        return self.entries.get(rel_path)
+
+    def paths(self):
+        """Snapshot of indexed paths, safe while other threads update the index."""
+        with self._lock:
+            return list(self.entries)
+
+    def update(self, rel_path: str, size: int, mtime_ns: int, digest: str):
+        with self._lock:
+            self.entries[rel_path] = (size, mtime_ns, digest)
+            self._append(f"{size}\t{mtime_ns}\t{digest}\t{rel_path}\n")
+
+    def remove(self, rel_path: str):
+        with self._lock:
+            if self.entries.pop(rel_path, None) is not None:
+                self._append(f"-\t{rel_path}\n")
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+            if self._journal_lines > 2 * len(self.entries) + 1024:
+                self._compact()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8', errors='surrogateescape') as file:
+                if file.readline() != self.HEADER:
+                    return
+                for line in file:
+                    self._journal_lines += 1
+                    parts = line.rstrip('\n').split('\t', 3)
+                    if parts[0] == '-' and len(parts) == 2:
+                        self.entries.pop(parts[1], None)
+                    elif len(parts) == 4:
+                        self.entries[parts[3]] = (int(parts[0]), int(parts[1]), parts[2])
+        except (OSError, ValueError):
+            self.entries = {}
+            self._journal_lines = 0
+
+    def _append(self, line: str):
+        if self._file is None:
+            new_file = not os.path.exists(self.path)
+            self._file = open(self.path, 'a', encoding='utf-8', errors='surrogateescape')
+            if new_file:
+                self._file.write(self.HEADER)
+        self._file.write(line)
+        self._journal_lines += 1
+
+    def _compact(self):
+        """Rewrite the journal with one line per live entry."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8', errors='surrogateescape') as file:
+            file.write(self.HEADER)
+            for rel_path, (size, mtime_ns, digest) in self.entries.items():
+                file.write(f"{size}\t{mtime_ns}\t{digest}\t{rel_path}\n")
+        os.replace(tmp_path, self.path)
+        self._journal_lines = len(self.entries)
+
+class DirectoryWatcher:
+    """Compresses new or changed files from watch_dir into output_dir.
+
+    A file is only queued once it has not been modified for
+    settle_seconds, so files still being written are picked up once.
+    At most max_queued files are queued or running at a time; the rest
+    are left for later polls.
+
+    Files are compressed sequentially with chunk_size; parallelism comes
+    from compressing several files at once. chunk_size=None picks a
+    chunk size per file from one shared AutoTuner.
+    """
+
+    def __init__(self, watch_dir: str, output_dir: str, state_path: Optional[str] = None,
+                 workers: int = 2, poll_interval: float = 2.0, settle_seconds: float = 1.0,
+                 compressor_factory: Optional[Callable[[Job], SequentialCompressor]] = None,
+                 max_queued: Optional[int] = None, chunk_size: Optional[int] = 1024 * 1024):
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.max_queued = max_queued or 4 * workers
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.index = StateIndex(state_path or os.path.join(self.output_dir, '.pzip-watch-index'))
+        index_path = os.path.abspath(self.index.path)
+        self._index_files = {index_path, f"{index_path}.tmp"}  # Never compress our own state
+
+        self.chunk_size = chunk_size
+        self.tuner = AutoTuner() if chunk_size is None and compressor_factory is None else None
+        self._compressor_factory = compressor_factory or self._default_compressor
+        self._chunkers: Dict[int, _HashingChunker] = {}  # job id -> chunker hashing its input
+        self.job_manager = JobManager(max_workers=workers, on_update=self._on_job_update,
+                                      compressor_factory=self._hashing_compressor)
+
+        self._lock = threading.Lock()
+        self._settling: Dict[str, Tuple[int, int]] = {}  # rel_path -> (size, mtime_ns) of files still being written
+        self._inflight: Dict[int, Tuple[str, int, int, Optional[str]]] = {}  # job id -> (rel_path, size, mtime_ns, hash)
+        self._inflight_paths: Set[str] = set()
+        self._started = time.monotonic()
+        self._counters = {
+            'files_compressed': 0,
+            'files_failed': 0,
+            'files_unchanged': 0,
+            'bytes_in': 0,
+            'bytes_out': 0,
+            'scans': 0,
+            'last_scan_seconds': 0.0,
+            'deferred': 0,
+        }
+
+    def poll_once(self) -> int:
+        """Scan the directory once and queue settled new or changed files. Returns jobs queued."""
+        scan_start = time.monotonic()
+        now = time.time()
+        seen = set()
+        queued = 0
+        deferred = 0
+
+        for rel_path, size, mtime_ns in self._scan():
+            seen.add(rel_path)
+            entry = self.index.get(rel_path)
+            if entry and entry[0] == size and entry[1] == mtime_ns:
+                continue
+            with self._lock:
+                if rel_path in self._inflight_paths:
+                    continue
+                if len(self._inflight) >= self.max_queued:
+                    deferred += 1  # Keep scanning so deletions are still noticed
+                    continue
+            if not self._settled(rel_path, size, mtime_ns, now):
+                continue
+
+            digest = None
+            if entry and entry[0] == size:
+                # Same size, new mtime: skip if the content is unchanged
+                digest = self._hash(rel_path)
+                if digest == entry[2]:
+                    self.index.update(rel_path, size, mtime_ns, digest)
+                    self._counters['files_unchanged'] += 1
+                    continue
+
+            self._submit(rel_path, size, mtime_ns, digest)
+            queued += 1
+
+        # Forget files that have disappeared from the spool directory
+        for rel_path in [p for p in self.index.paths() if p not in seen]:
+            self.index.remove(rel_path)
+        with self._lock:
+            for rel_path in [p for p in self._settling if p not in seen]:
+                del self._settling[rel_path]
+
+        self.index.flush()
+        self._counters['scans'] += 1
+        self._counters['deferred'] = deferred
+        self._counters['last_scan_seconds'] = time.monotonic() - scan_start
+        return queued
+
+    def run(self, stop_event: Optional[threading.Event] = None):
+        """Poll until stop_event is set."""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.poll_once()
+            stop_event.wait(self.poll_interval)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued compression has finished."""
+        return self.job_manager.wait(timeout)
+
+    def close(self, cancel_pending: bool = False):
+        """Stop the worker pool and persist the index."""
+        self.job_manager.shutdown(wait=True, cancel_pending=cancel_pending)
+        self.index.flush()
+        self.index.close()
+
+    def metrics(self) -> Dict:
+        """Throughput and backlog figures for monitoring."""
+        with self._lock:
+            metrics = dict(self._counters)
+            metrics['settling'] = len(self._settling)
+            metrics['backlog'] = len(self._inflight) + len(self._settling) + metrics['deferred']
+        metrics['files_tracked'] = len(self.index.entries)
+        elapsed = time.monotonic() - self._started
+        metrics['uptime_seconds'] = elapsed
+        metrics['throughput_mb_s'] = (metrics['bytes_in'] / (1024 * 1024)) / elapsed if elapsed > 0 else 0.0
+        return metrics
+
+    def _default_compressor(self, job: Job) -> SequentialCompressor:
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = self.tuner.choose(os.path.getsize(job.input_path),
+                                          self.output_dir)['chunk_size']
+        return SequentialCompressor(chunk_size)
+
+    def _hashing_compressor(self, job: Job) -> SequentialCompressor:
+        """Build the job's compressor with a chunker that hashes what it reads."""
+        compressor = self._compressor_factory(job)
+        chunker = _HashingChunker(compressor.chunker.chunk_size)
+        compressor.chunker = chunker
+        with self._lock:
+            self._chunkers[job.id] = chunker
+        return compressor
+
+    def output_path_for(self, rel_path: str) -> str:
+        return os.path.join(self.output_dir, f"{rel_path}.pzip")
+
+    def _scan(self) -> Iterator[Tuple[str, int, int]]:
+        """Yield (relative path, size, mtime_ns) of regular files to consider."""
+        prefix_len = len(os.path.join(self.watch_dir, ''))
+        stack = [self.watch_dir]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path != self.output_dir:
+                                stack.append(entry.path)
+                            continue
+                        if (not entry.is_file(follow_symlinks=False) or entry.name.endswith('.pzip')
+                                or entry.path in self._index_files):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    rel_path = entry.path[prefix_len:]  # Cheaper than relpath on huge trees
+                    if '\n' in rel_path or '\t' in rel_path:
+                        continue  # Not representable in the index
+                    yield rel_path, stat.st_size, stat.st_mtime_ns
+
+    def _settled(self, rel_path: str, size: int, mtime_ns: int, now: float) -> bool:
+        """True once a file has not been modified for settle_seconds."""
+        with self._lock:
+            if now - mtime_ns / 1e9 < self.settle_seconds:
+                self._settling[rel_path] = (size, mtime_ns)
+                return False
+            self._settling.pop(rel_path, None)
+            return True
+
+    def _hash(self, rel_path: str) -> Optional[str]:
+        try:
+            return file_hash(os.path.join(self.watch_dir, rel_path))
+        except OSError:
+            return None
+
+    def _submit(self, rel_path: str, size: int, mtime_ns: int, digest: Optional[str]):
+        output_path = self.output_path_for(rel_path)
+        with self._lock:
+            self._inflight_paths.add(rel_path)
+            job = self.job_manager.submit('compress', os.path.join(self.watch_dir, rel_path), output_path)
+            self._inflight[job.id] = (rel_path, size, mtime_ns, digest)
+
+    def _on_job_update(self, job: Job):
+        if not job.finished:
+            return
+        self.job_manager.forget(job.id)  # The index is the long-term record
+        with self._lock:
+            record = self._inflight.pop(job.id, None)
+            chunker = self._chunkers.pop(job.id, None)
+            if record is None:
+                return
+            rel_path, size, mtime_ns, digest = record
+            self._inflight_paths.discard(rel_path)
+            if job.status != COMPLETED:
+                if job.status == FAILED:
+                    self._counters['files_failed'] += 1
+            elif chunker is not None and chunker.digest:
+                digest = chunker.digest
+
+        try:
+            stat = os.stat(job.input_path)
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                return  # Changed while compressing; the next poll picks it up again
+            if job.status == FAILED:
+                # Remember the failure so it is only retried after the file changes
+                self.index.update(rel_path, size, mtime_ns, FAILED_DIGEST)
+                return
+            if job.status != COMPLETED:
+                return
+            digest = digest or file_hash(job.input_path)
+            compressed_size = os.path.getsize(job.output_path)
+        except OSError:
+            return
+
+        self.index.update(rel_path, size, mtime_ns, digest)
+        with self._lock:
+            self._counters['files_compressed'] += 1
+            self._counters['bytes_in'] += size
+            self._counters['bytes_out'] += compressed_size
+
+def main(argv=None):
+    """Command-line entry point: python -m src.watcher WATCH_DIR OUTPUT_DIR"""
+    parser = argparse.ArgumentParser(description="Compress new files dropped into a directory")
+    parser.add_argument('watch_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--chunk-size', type=int, default=1024 * 1024,
+                        help="Chunk size in bytes (0 picks one per file automatically)")
+    parser.add_argument('--interval', type=float, default=2.0, help="Seconds between scans")
+    parser.add_argument('--settle', type=float, default=1.0,
+                        help="Seconds a file must be unchanged before it is compressed")
+    args = parser.parse_args(argv)
+
+    watcher = DirectoryWatcher(args.watch_dir, args.output_dir, workers=args.workers,
+                               poll_interval=args.interval, settle_seconds=args.settle,
+                               chunk_size=args.chunk_size or None)
+    print(f"Watching {watcher.watch_dir} -> {watcher.output_dir}")
+    try:
+        while True:
+            watcher.poll_once()
+            m = watcher.metrics()
+            print(f"compressed={m['files_compressed']} failed={m['files_failed']} "
+                  f"backlog={m['backlog']} throughput={m['throughput_mb_s']:.2f} MB/s "
+                  f"scan={m['last_scan_seconds']:.3f}s")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopping watcher...")
+    finally:
+        watcher.close(cancel_pending=True)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
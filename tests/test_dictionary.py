@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.compressor import PzipReader, SequentialCompressor
+from src.dictionary import sample_file, train_dictionary
+from src.utils import FileChunker
+from src.parallel import ParallelCompressor
+
+def _records_file(path, count=4000):
+    """Many small JSON records with repeated keys and varying values."""
+    with open(path, 'w') as f:
+        for i in range(count):
+            f.write(json.dumps({"timestamp": f"2024-05-{i % 28 + 1:02d}T12:{i % 60:02d}:00Z",
+                                "service": "ingest-gateway", "level": "INFO",
+                                "request_id": f"{i * 2654435761 % 2**32:08x}",
+                                "message": "request processed", "latency_ms": i % 997}) + "\n")
+
+def test_dictionary_round_trip_and_ratio(tmp_path):
+    """Dictionary mode stays lossless and beats plain zlib on small chunks."""
+    source = str(tmp_path / "records.jsonl")
+    _records_file(source)
+
+    plain = str(tmp_path / "plain.pzip")
+    shared = str(tmp_path / "shared.pzip")
+    assert SequentialCompressor(4 * 1024).compress_file(source, plain)
+    assert SequentialCompressor(4 * 1024, use_dictionary=True).compress_file(source, shared)
+    assert os.path.getsize(shared) < os.path.getsize(plain)
+
+    for compressor in (SequentialCompressor(), ParallelCompressor(workers=3)):
+        restored = str(tmp_path / "restored.jsonl")
+        assert compressor.decompress_file(shared, restored)
+        with open(source, 'rb') as f1, open(restored, 'rb') as f2:
+            assert f1.read() == f2.read()
+
+def test_random_access_chunk(tmp_path):
+    """Any chunk decodes on its own using the stored dictionary."""
+    source = str(tmp_path / "records.jsonl")
+    _records_file(source, count=500)
+    compressed = str(tmp_path / "shared.pzip")
+    assert ParallelCompressor(4 * 1024, workers=2, use_dictionary=True).compress_file(source, compressed)
+
+    with open(source, 'rb') as f:
+        f.seek(5 * 4 * 1024)
+        expected = f.read(4 * 1024)
+    compressor = SequentialCompressor(64 * 1024)
+    assert compressor.decompress_chunk(compressed, 5) == expected
+    assert compressor.chunker.chunk_size == 64 * 1024 and compressor.dictionary is None
+
+def test_reader_serves_repeated_random_reads(tmp_path):
+    """PzipReader decodes chunks in any order from one cached header."""
+    source = str(tmp_path / "records.jsonl")
+    _records_file(source, count=500)
+    compressed = str(tmp_path / "shared.pzip")
+    assert ParallelCompressor(4 * 1024, workers=2, use_dictionary=True).compress_file(source, compressed)
+
+    with open(source, 'rb') as f:
+        original = f.read()
+    with PzipReader(compressed) as reader:
+        assert reader.original_size == len(original) and reader.chunk_size == 4 * 1024
+        for index in (reader.total_chunks - 1, 0, 7, 3, reader.total_chunks - 1):
+            assert reader.read_chunk(index) == original[index * 4 * 1024:(index + 1) * 4 * 1024]
+        with pytest.raises(IndexError):
+            reader.read_chunk(reader.total_chunks)
+
+def test_unrelated_samples_give_no_dictionary():
+    """Random data shares no content, so no dictionary is produced."""
+    assert train_dictionary([os.urandom(2048) for _ in range(8)]) == b''
+
+def test_samples_cover_whole_file(tmp_path):
+    """Sampled chunks are spread from the start to the end of the file."""
+    chunk_size = 8 * 1024
+    for total_chunks in (10, 40, 100, 127, 1000):
+        path = str(tmp_path / f"chunks-{total_chunks}.bin")
+        with open(path, 'wb') as f:
+            for i in range(total_chunks):
+                f.write(i.to_bytes(4, 'little') * (chunk_size // 4))
+
+        samples = sample_file(FileChunker(chunk_size), path)
+        assert len(samples) <= 128
+        indexes = sorted({int.from_bytes(sample[:4], 'little') for sample in samples})
+        spacing = max(b - a for a, b in zip(indexes, indexes[1:])) if len(indexes) > 1 else 1
+        assert indexes[0] == 0
+        assert indexes[-1] >= total_chunks - spacing
+        assert len(indexes) >= min(total_chunks, 32) // 2
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import sys
+import os
+import socket
+import time
+import threading
+import multiprocessing
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.compressor import SequentialCompressor
+from src.distributed import (REQUEST_HEADER, REQUEST_MAGIC, RESPONSE_HEADER, STATUS_ERROR, STATUS_OK,
+                             ChunkWorker, DistributedCompressor, _recv_exact)
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_files", "medium_test.txt")
+
+def _run_worker(address_queue, shared_root=None):
+    with ChunkWorker('127.0.0.1', 0, shared_root) as worker:
+        address_queue.put(worker.address)
+        worker.serve_forever()
+
+def _start_workers(count, shared_root=None):
+    address_queue = multiprocessing.Queue()
+    processes = []
+    for _ in range(count):
+        process = multiprocessing.Process(target=_run_worker, args=(address_queue, shared_root),
+                                          daemon=True)
+        process.start()
+        processes.append(process)
+    addresses = [tuple(address_queue.get(timeout=10)) for _ in range(count)]
+    return processes, addresses
+
+def _stop_workers(processes):
+    for process in processes:
+        process.terminate()
+        process.join(5)
+
+def _broken_worker():
+    """Accepts a connection, reads a little, then drops it."""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+
+    def serve():
+        conn, _ = server.accept()
+        conn.recv(16)
+        conn.close()
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server.getsockname()
+
+def _assert_round_trip(tmp_path, compressed):
+    restored = str(tmp_path / "restored.txt")
+    assert SequentialCompressor().decompress_file(compressed, restored)
+    with open(TEST_FILE, 'rb') as f1, open(restored, 'rb') as f2:
+        assert f1.read() == f2.read()
+
+def test_distributed_compression_on_localhost(tmp_path):
+    """Several worker processes produce a valid, ordered .pzip."""
+    processes, addresses = _start_workers(3, shared_root=os.path.dirname(TEST_FILE))
+    try:
+        for shared_path in (False, True):
+            compressed = str(tmp_path / f"out-{shared_path}.pzip")
+            compressor = DistributedCompressor(addresses, chunk_size=1024, shared_path=shared_path)
+            assert compressor.compress_file(TEST_FILE, compressed)
+            assert sum(compressor.metrics['chunks_per_worker'].values()) == compressor.metrics['total_chunks']
+            _assert_round_trip(tmp_path, compressed)
+    finally:
+        _stop_workers(processes)
+
+def test_chunks_from_failed_worker_are_retried(tmp_path):
+    """A worker that drops its connection does not lose chunks."""
+    processes, addresses = _start_workers(2)
+    try:
+        compressed = str(tmp_path / "out.pzip")
+        compressor = DistributedCompressor([_broken_worker()] + addresses, chunk_size=1024)
+        assert compressor.compress_file(TEST_FILE, compressed)
+        assert len(compressor.metrics['failed_workers']) == 1
+        assert compressor.metrics['retries'] >= 1
+        _assert_round_trip(tmp_path, compressed)
+    finally:
+        _stop_workers(processes)
+
+def test_all_workers_failed(tmp_path):
+    """Compression reports failure when no worker is reachable."""
+    compressed = str(tmp_path / "out.pzip")
+    compressor = DistributedCompressor([_broken_worker()], chunk_size=1024)
+    assert not compressor.compress_file(TEST_FILE, compressed)
+
+def _request_path(address, path):
+    """Send a raw path request and return the response status."""
+    with socket.create_connection(address, timeout=5) as sock:
+        encoded = path.encode('utf-8')
+        sock.sendall(REQUEST_HEADER.pack(REQUEST_MAGIC, 0, 0, 16, 6, len(encoded)) + encoded)
+        return RESPONSE_HEADER.unpack(_recv_exact(sock, RESPONSE_HEADER.size))[2]
+
+def test_path_requests_confined_to_shared_root(tmp_path):
+    """Workers refuse path requests unless enabled, and never outside their root."""
+    inside = tmp_path / "inside.txt"
+    inside.write_bytes(b"x" * 64)
+    (tmp_path / "link").symlink_to("/etc/hostname")
+
+    with ChunkWorker('127.0.0.1', 0) as closed_worker:
+        threading.Thread(target=closed_worker.serve_forever, daemon=True).start()
+        assert _request_path(closed_worker.address, str(inside)) == STATUS_ERROR
+        closed_worker.shutdown()
+
+    with ChunkWorker('127.0.0.1', 0, shared_root=str(tmp_path)) as worker:
+        threading.Thread(target=worker.serve_forever, daemon=True).start()
+        assert _request_path(worker.address, str(inside)) == STATUS_OK
+        assert _request_path(worker.address, "/etc/passwd") == STATUS_ERROR
+        assert _request_path(worker.address, str(tmp_path / ".." / "etc")) == STATUS_ERROR
+        assert _request_path(worker.address, str(tmp_path / "link")) == STATUS_ERROR
+        worker.shutdown()
+
+def _silent_worker():
+    """Accepts a connection and reads requests but never answers."""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+
+    def serve():
+        conn, _ = server.accept()
+        while conn.recv(65536):
+            pass
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server.getsockname()
+
+def test_cancel_stops_promptly(tmp_path):
+    """Cancelling does not wait for in-flight chunks or the socket timeout."""
+    cancel = threading.Event()
+    compressed = str(tmp_path / "out.pzip")
+    compressor = DistributedCompressor([_silent_worker()], chunk_size=1024, timeout=30)
+    threading.Timer(0.2, cancel.set).start()
+
+    start = time.monotonic()
+    assert not compressor.compress_file(TEST_FILE, compressed, cancel_event=cancel)
+    assert time.monotonic() - start < 5
+    assert not os.path.exists(compressed)
+
+def test_chunks_larger_than_socket_buffers(tmp_path):
+    """Pipelined requests and responses bigger than the kernel buffers do not deadlock."""
+    source = str(tmp_path / "random.bin")
+    with open(source, 'wb') as f:
+        f.write(os.urandom(48 * 1024 * 1024))
+
+    with ChunkWorker('127.0.0.1', 0) as worker:
+        threading.Thread(target=worker.serve_forever, daemon=True).start()
+        compressor = DistributedCompressor([worker.address], chunk_size=16 * 1024 * 1024,
+                                           connections_per_worker=1, pipeline_depth=2, timeout=10)
+        compressor.compression_level = 1
+        compressed = str(tmp_path / "out.pzip")
+        try:
+            assert compressor.compress_file(source, compressed)
+        finally:
+            worker.shutdown()
+
+    assert compressor.metrics['retries'] == 0
+    restored = str(tmp_path / "restored.bin")
+    assert SequentialCompressor().decompress_file(compressed, restored)
+    with open(source, 'rb') as f1, open(restored, 'rb') as f2:
+        assert f1.read() == f2.read()
+
+@pytest.mark.skipif(not os.environ.get('PZIP_BENCHMARK'),
+                    reason="timing benchmark; set PZIP_BENCHMARK=1 to run")
+def test_throughput_scales_with_workers(tmp_path):
+    """Four local workers reach a throughput proportional to the cores available."""
+    source = str(tmp_path / "big.log")
+    with open(source, 'wb') as f:
+        for i in range(300000):
+            f.write(b"record=%d level=INFO msg=hello world %d\n" % (i, i * 7919 % 1000))
+    size = os.path.getsize(source)
+
+    start = time.perf_counter()
+    assert SequentialCompressor(256 * 1024).compress_file(source, str(tmp_path / "local.pzip"))
+    local_rate = size / (time.perf_counter() - start)
+
+    processes, addresses = _start_workers(4)
+    try:
+        compressor = DistributedCompressor(addresses, chunk_size=256 * 1024)
+        start = time.perf_counter()
+        assert compressor.compress_file(source, str(tmp_path / "dist.pzip"))
+        distributed_rate = size / (time.perf_counter() - start)
+    finally:
+        _stop_workers(processes)
+
+    cores = min(4, len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1)
+    assert distributed_rate >= 0.4 * cores * local_rate
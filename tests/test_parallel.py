@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parallel import ParallelCompressor
+from src.tuning import AutoTuner
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_files", "medium_test.txt")
+
+def _fixed_tuner(tmp_path, codec_rate, disk_rate):
+    """Tuner with a pre-seeded calibration so no probe runs."""
+    tuner = AutoTuner(cache_path=str(tmp_path / "calibration.json"))
+    tuner._calibration = {'codec_bytes_per_sec': codec_rate,
+                          'disk': {os.path.realpath(str(tmp_path)): disk_rate}}
+    return tuner
+
+def test_parallel_round_trip(tmp_path):
+    """Parallel compression output decompresses to the original bytes."""
+    compressor = ParallelCompressor(chunk_size=64 * 1024, workers=4)
+    compressed = str(tmp_path / "out.pzip")
+    restored = str(tmp_path / "out.txt")
+
+    assert compressor.compress_file(TEST_FILE, compressed)
+    assert compressor.metrics['workers'] == 4
+    assert compressor.decompress_file(compressed, restored)
+    with open(TEST_FILE, 'rb') as f1, open(restored, 'rb') as f2:
+        assert f1.read() == f2.read()
+
+def test_auto_tune_records_choice(tmp_path):
+    """Auto mode records its chosen parameters in the metrics."""
+    compressor = ParallelCompressor(auto_tune=True, tuner=_fixed_tuner(tmp_path, 50e6, 500e6))
+    compressed = str(tmp_path / "out.pzip")
+
+    assert compressor.compress_file(TEST_FILE, compressed)
+    tuning = compressor.metrics['tuning']
+    assert tuning['chunk_size'] == compressor.metrics['chunk_size']
+    assert 1 <= tuning['workers'] <= AutoTuner.available_cpus()
+    assert tuning['disk_probe_dir'] == os.path.realpath(str(tmp_path))
+    # Tuned values belong to that run; the instance keeps its own settings
+    assert compressor.workers == AutoTuner.available_cpus()
+    assert compressor.chunker.chunk_size == 1024 * 1024
+
+def test_tuner_choices(tmp_path):
+    """Tiny files get one chunk; slow storage caps the worker count."""
+    tuner = _fixed_tuner(tmp_path, 50e6, 500e6)
+    tiny = tuner.choose(1000, str(tmp_path))
+    assert tiny['workers'] == 1 and tiny['chunk_size'] >= 1000
+
+    big = tuner.choose(10 * 1024 ** 3, str(tmp_path))
+    assert big['chunk_size'] == AutoTuner.MAX_CHUNK_SIZE
+    assert tuner.choose(10 * 1024 ** 3, str(tmp_path), max_workers=1)['workers'] == 1
+
+    slow_disk = _fixed_tuner(tmp_path, 50e6, 40e6).choose(10 * 1024 ** 3, str(tmp_path))
+    assert slow_disk['workers'] == 1
+
+def test_calibration_cached(tmp_path):
+    """Calibration is written once and reused by a fresh tuner."""
+    cache = str(tmp_path / "calibration.json")
+    first = AutoTuner(cache_path=cache, probe_size=256 * 1024).calibrate()
+    assert os.path.exists(cache)
+    second = AutoTuner(cache_path=cache, probe_size=256 * 1024).calibrate()
+    assert second['timestamp'] == first['timestamp']
+
+def test_disk_probe_uses_output_dir(tmp_path):
+    """Disk throughput is measured in, and cached for, the output directory."""
+    cache = str(tmp_path / "calibration.json")
+    out_a = tmp_path / "a"
+    out_b = tmp_path / "b"
+    out_a.mkdir()
+    out_b.mkdir()
+    tuner = AutoTuner(cache_path=cache, probe_size=256 * 1024)
+    assert tuner.calibrate(output_dir=str(out_a))['disk_probe_dir'] == os.path.realpath(str(out_a))
+    # A directory that does not exist yet is measured at its nearest existing parent
+    missing = tuner.calibrate(output_dir=str(out_b / "new" / "dir"))
+    assert missing['disk_probe_dir'] == os.path.realpath(str(out_b))
+    assert os.listdir(out_a) == [] and os.listdir(out_b) == []
+
+    fresh = AutoTuner(cache_path=cache, probe_size=256 * 1024)
+    fresh._probe_disk = None  # Cached directories must not be probed again
+    assert fresh.calibrate(output_dir=str(out_a))['disk_probe_dir'] == os.path.realpath(str(out_a))
+    assert fresh.calibrate(output_dir=str(out_b))['disk_probe_dir'] == os.path.realpath(str(out_b))
+
+def test_in_flight_matches_tuner():
+    """The pipeline keeps as many chunks in flight as the tuner sizes chunks for."""
+    compressor = ParallelCompressor(chunk_size=64 * 1024, workers=3)
+    assert compressor._max_in_flight() == 3 * AutoTuner.CHUNKS_PER_WORKER
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.compressor import SequentialCompressor
+from src.parallel import ParallelCompressor
+from src.scheduler import CANCELLED, COMPLETED, JobManager
+from src.tuning import AutoTuner
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_files", "medium_test.txt")
+
+def test_jobs_complete_in_priority_order(tmp_path):
+    """With one worker, a blocked queue drains highest priority first."""
+    gate = threading.Event()
+    running = threading.Event()
+    started = []
+
+    def factory(job):
+        started.append(job.id)
+        running.set()
+        gate.wait(5)
+        return SequentialCompressor(64 * 1024)
+
+    manager = JobManager(max_workers=1, compressor_factory=factory)
+    first = manager.submit('compress', TEST_FILE, str(tmp_path / "a.pzip"))
+    assert running.wait(5)
+    low = manager.submit('compress', TEST_FILE, str(tmp_path / "b.pzip"), priority=-1)
+    high = manager.submit('compress', TEST_FILE, str(tmp_path / "c.pzip"), priority=5)
+    gate.set()
+
+    assert manager.wait(10)
+    manager.shutdown()
+    assert started == [first.id, high.id, low.id]
+    assert all(job.status == COMPLETED for job in manager.jobs())
+
+def test_cancel_running_job_removes_output(tmp_path):
+    """A cancelled job stops at the next chunk and leaves no partial file."""
+    reached_chunk = threading.Event()
+    output = str(tmp_path / "out.pzip")
+    manager = JobManager(max_workers=1,
+                         compressor_factory=lambda job: SequentialCompressor(1024))
+
+    def on_update(job):
+        if job.progress > 0 and not reached_chunk.is_set():
+            reached_chunk.set()
+            manager.cancel(job.id)
+
+    manager.on_update = on_update
+    job = manager.submit('compress', TEST_FILE, output)
+
+    assert manager.wait(10)
+    manager.shutdown()
+    assert job.status == CANCELLED
+    assert not os.path.exists(output)
+
+def test_cancel_queued_job(tmp_path):
+    """Cancelling a job that has not started marks it cancelled immediately."""
+    gate = threading.Event()
+
+    def factory(job):
+        gate.wait(5)
+        return SequentialCompressor()
+
+    manager = JobManager(max_workers=1, compressor_factory=factory)
+    manager.submit('compress', TEST_FILE, str(tmp_path / "a.pzip"))
+    queued = manager.submit('compress', TEST_FILE, str(tmp_path / "b.pzip"))
+
+    assert manager.cancel(queued.id)
+    assert queued.status == CANCELLED
+    gate.set()
+    assert manager.wait(10)
+    manager.shutdown()
+    assert not manager.cancel(queued.id)
+    assert not os.path.exists(str(tmp_path / "b.pzip"))
+
+def test_auto_jobs_share_cpu_budget(tmp_path, monkeypatch):
+    """Automatic jobs split the CPUs between job threads and share one tuner."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "cache"))
+    monkeypatch.setattr(AutoTuner, 'available_cpus', staticmethod(lambda: 8))
+    manager = JobManager(max_workers=2)
+    assert manager.codec_workers == 4
+
+    job = manager.submit('compress', TEST_FILE, str(tmp_path / "a.pzip"))
+    assert manager.wait(30)
+    assert job.status == COMPLETED
+    assert job.metrics['workers'] <= 4
+    compressors = [manager.compressor_factory(job) for _ in range(2)]
+    assert all(isinstance(c, ParallelCompressor) and c.workers == 4 for c in compressors)
+    assert compressors[0].tuner is compressors[1].tuner
+    manager.shutdown()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.compressor import SequentialCompressor
+import src.watcher as watcher_module
+from src.watcher import DirectoryWatcher, StateIndex
+
+def _write(path, data, age=10):
+    """Write a file and backdate its mtime so it counts as settled."""
+    with open(path, 'wb') as f:
+        f.write(data)
+    stamp = os.stat(path).st_mtime - age
+    os.utime(path, (stamp, stamp))
+
+def _make_watcher(tmp_path, **kwargs):
+    return DirectoryWatcher(str(tmp_path / "spool"), str(tmp_path / "out"), workers=2, **kwargs)
+
+def test_compresses_only_new_or_changed_files(tmp_path):
+    """Files are compressed once; only content changes trigger recompression."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    (spool / "sub").mkdir()
+    _write(str(spool / "a.log"), b"alpha " * 1000)
+    _write(str(spool / "sub" / "b.log"), b"beta " * 1000)
+
+    watcher = _make_watcher(tmp_path)
+    assert watcher.poll_once() == 2
+    assert watcher.wait_idle(10)
+    assert watcher.poll_once() == 0
+
+    restored = str(tmp_path / "b.restored")
+    assert SequentialCompressor().decompress_file(watcher.output_path_for(os.path.join("sub", "b.log")), restored)
+    with open(restored, 'rb') as f:
+        assert f.read() == b"beta " * 1000
+
+    # Touch without changing content: hashed, not recompressed
+    _write(str(spool / "a.log"), b"alpha " * 1000, age=5)
+    assert watcher.poll_once() == 0
+    _write(str(spool / "a.log"), b"ALPHA " * 1000, age=5)
+    assert watcher.poll_once() == 1
+    assert watcher.wait_idle(10)
+
+    metrics = watcher.metrics()
+    assert metrics['files_compressed'] == 3
+    assert metrics['files_unchanged'] == 1
+    assert metrics['backlog'] == 0
+    watcher.close()
+
+def test_index_persists_across_restarts(tmp_path):
+    """A restarted watcher does not recompress files it already handled."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    _write(str(spool / "a.log"), b"data " * 100)
+
+    watcher = _make_watcher(tmp_path)
+    watcher.poll_once()
+    watcher.wait_idle(10)
+    watcher.close()
+
+    restarted = _make_watcher(tmp_path)
+    assert restarted.metrics()['files_tracked'] == 1
+    assert restarted.poll_once() == 0
+    restarted.close()
+
+def test_in_place_output_skips_state_index(tmp_path):
+    """With output_dir == watch_dir the watcher never compresses its own index."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    _write(str(spool / "a.log"), b"data " * 100)
+
+    watcher = DirectoryWatcher(str(spool), str(spool), workers=1, settle_seconds=0)
+    for _ in range(4):
+        watcher.poll_once()
+        assert watcher.wait_idle(10)
+        watcher.index.flush()
+    assert sorted(os.listdir(spool)) == [".pzip-watch-index", "a.log", "a.log.pzip"]
+    assert watcher.metrics()['files_compressed'] == 1
+    watcher.close()
+
+def test_files_still_being_written_wait(tmp_path):
+    """Recently modified files are held back until they settle."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    _write(str(spool / "partial.log"), b"partial", age=0)
+
+    watcher = _make_watcher(tmp_path, settle_seconds=60)
+    assert watcher.poll_once() == 0
+    assert watcher.metrics()['settling'] == 1
+    watcher.close()
+
+def test_state_index_compaction(tmp_path):
+    """Superseded journal lines are dropped when the index is compacted."""
+    path = str(tmp_path / "index")
+    index = StateIndex(path)
+    for i in range(3000):
+        index.update("same.log", i, i, "h")
+    index.update("gone.log", 1, 1, "h")
+    index.remove("gone.log")
+    index.flush()
+    index.close()
+
+    with open(path) as f:
+        assert len(f.readlines()) == 2
+    assert StateIndex(path).entries == {"same.log": (2999, 2999, "h")}
+
+def test_poll_queues_at_most_max_queued(tmp_path):
+    """A large initial backlog is drained over several polls without job history growing."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    for i in range(10):
+        _write(str(spool / f"f{i}.log"), b"line %d\n" % i * 50)
+
+    gate = threading.Event()
+
+    def factory(job):
+        gate.wait(10)
+        return SequentialCompressor()
+
+    watcher = _make_watcher(tmp_path, max_queued=4, compressor_factory=factory)
+    assert watcher.poll_once() == 4
+    assert watcher.metrics()['deferred'] == 6
+    gate.set()
+
+    total = 4
+    while total < 10:
+        assert watcher.wait_idle(10)
+        total += watcher.poll_once()
+    assert watcher.wait_idle(10)
+    assert watcher.metrics()['files_compressed'] == 10
+    assert watcher.job_manager.jobs() == []
+    watcher.close()
+
+def test_auto_chunk_size_shares_one_tuner(tmp_path, monkeypatch):
+    """Automatic chunk sizing calibrates once, caching under XDG_CACHE_HOME."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "cache"))
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    for i in range(3):
+        _write(str(spool / f"f{i}.log"), b"auto %d\n" % i * 100)
+
+    watcher = _make_watcher(tmp_path, chunk_size=None)
+    assert watcher.poll_once() == 3
+    assert watcher.wait_idle(10)
+    assert watcher.metrics()['files_compressed'] == 3
+    assert os.path.exists(tmp_path / "cache" / "pzip" / "calibration.json")
+    watcher.close()
+
+def test_hash_comes_from_compression_pass(tmp_path, monkeypatch):
+    """New files are not re-read after compression just to hash them."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    _write(str(spool / "a.log"), b"hash me " * 500)
+
+    def no_rehash(path, block_size=1024 * 1024):
+        raise AssertionError("file re-read for hashing")
+
+    monkeypatch.setattr(watcher_module, 'file_hash', no_rehash)
+    watcher = _make_watcher(tmp_path)
+    assert watcher.poll_once() == 1
+    assert watcher.wait_idle(10)
+    monkeypatch.undo()
+
+    assert watcher.index.get("a.log")[2] == watcher_module.file_hash(str(spool / "a.log"))
+    watcher.close()
+
+def test_failed_file_retried_only_after_change(tmp_path):
+    """A file that fails to compress is not retried until it changes."""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    _write(str(spool / "bad.log"), b"bad")
+    attempts = []
+
+    def failing_factory(job):
+        attempts.append(job.input_path)
+        raise OSError("disk full")
+
+    watcher = _make_watcher(tmp_path, compressor_factory=failing_factory)
+    assert watcher.poll_once() == 1
+    assert watcher.wait_idle(10)
+    assert watcher.poll_once() == 0
+    assert watcher.metrics()['files_failed'] == 1
+
+    _write(str(spool / "bad.log"), b"bad, but different", age=5)
+    assert watcher.poll_once() == 1
+    assert watcher.wait_idle(10)
+    assert len(attempts) == 2
+    watcher.close()